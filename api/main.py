@@ -1,14 +1,62 @@
 # app/main.py
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, BackgroundTasks
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeout
 from sqlalchemy.orm import Session
 import src.schemas as schema
 import src.crud as crud
-from src.crud import CRUDBase
-from src.dependancies import get_db
-from src.settings import hot_reload
-from typing import Type
+from src.crud import CRUDBase, PartitionArchived
+from src.schemas.changes import Changes
+from src.dependancies import get_db, get_read_db, READ_PRIMARY_COOKIE
+from src.database import replicas, UnreachableDatabase
+from src.admission import admit, Overloaded
+from src.settings import hot_reload, read_your_writes_window
+from src import admission, analytics, partitions, resumes
+from contextlib import asynccontextmanager
+from typing import Callable, Type
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    partitions.partition_maintainer.start()
+    yield
+
+app = FastAPI(lifespan=lifespan)
+app.include_router(admission.router)
+app.include_router(analytics.router)
+app.include_router(partitions.router)
+app.include_router(resumes.router)
+
+
+# Pins the client's reads to the primary for a while after a write, so it reads its own writes despite replica lag
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    if replicas.engines and request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+        response.set_cookie(READ_PRIMARY_COOKIE, '1', max_age=read_your_writes_window, httponly=True)
+    return response
+
+
+# Shed and starved requests fail fast with a 503 the client can retry, instead of a generic 500
+@app.exception_handler(Overloaded)
+def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(status_code=503, content={'detail': str(exc)}, headers={'Retry-After': str(exc.retry_after)})
+
+@app.exception_handler(PartitionArchived)
+def partition_archived_handler(request: Request, exc: PartitionArchived):
+    return JSONResponse(status_code=409, content={'detail': str(exc)})
+
+# E.g. deleting an application that responses still reference, as the foreign key triggers report it
+@app.exception_handler(IntegrityError)
+def integrity_error_handler(request: Request, exc: IntegrityError):
+    diag = getattr(exc.orig, 'diag', None)
+    detail = diag.message_primary if diag is not None else str(exc.orig)
+    return JSONResponse(status_code=409, content={'detail': detail})
+
+@app.exception_handler(UnreachableDatabase)
+@app.exception_handler(PoolTimeout)
+def database_unavailable_handler(request: Request, exc: Exception):
+    return JSONResponse(status_code=503, content={'detail': 'The database is currently unavailable.'}, headers={'Retry-After': '5'})
 
 
 # Create crud endpoints dynamically
@@ -16,43 +64,91 @@ def generate_crud_routes(
     app: FastAPI,
     model_name: str,
     schema: Type[schema._proto.SchemaProtocol],
-    crud_op: Type[CRUDBase]
+    crud_op: Type[CRUDBase],
+    on_write: Callable[[], None] | None = None
 ):
-    @app.post(f"/{model_name}/")
-    def create_endpoint(item: schema.Create, db: Session = Depends(get_db)) -> schema.Read:
-        return crud_op.create(db=db, obj_in=item)
+    # Runs after the response is sent, e.g. to refresh views derived from this model
+    def after_write(background_tasks: BackgroundTasks):
+        if on_write:
+            background_tasks.add_task(on_write)
+
+    # Every route holds an admission slot of its class; cheap detail reads are admitted before lists
+    @app.post(f"/{model_name}/", dependencies=[Depends(admit('write'))])
+    def create_endpoint(item: schema.Create, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> schema.Read:
+        created_item = crud_op.create(db=db, obj_in=item)
+        after_write(background_tasks)
+        return created_item
+
+    @app.get(f"/{model_name}/", dependencies=[Depends(admit('list'))])
+    def read_all_endpoint(
+        response: Response,
+        offset: int = Query(0, ge=0),
+        limit: int | None = Query(None, ge=1, le=1000),
+        sort: str | None = None,
+        descending: bool = False,
+        filter_field: str | None = None,
+        filter_value: str | None = None,
+        db: Session = Depends(get_read_db)
+    ) -> list[schema.Read]:
+        try:
+            items, total = crud_op.read_page(
+                db=db, offset=offset, limit=limit, sort=sort, descending=descending,
+                filter_field=filter_field, filter_value=filter_value
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        response.headers['X-Total-Count'] = str(total)
+        return items
+
+    # Registered before `/{item_id}` so "search" and "changes" are not parsed as ids
+    @app.get(f"/{model_name}/search", dependencies=[Depends(admit('detail'))])
+    def search_endpoint(
+        field: str,
+        prefix: str = '',
+        limit: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_read_db)
+    ) -> list[schema.Read]:
+        try:
+            return crud_op.search(db=db, field=field, prefix=prefix, limit=limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @app.get(f"/{model_name}/changes", dependencies=[Depends(admit('list'))])
+    def changes_endpoint(since: int = Query(0, ge=0), db: Session = Depends(get_read_db)) -> Changes[schema.Read]:
+        return crud_op.changes(db=db, since=since)
 
-    @app.get(f"/{model_name}/")
-    def read_all_endpoint(db: Session = Depends(get_db)) -> list[schema.Read]:
-        return crud_op.read_all(db=db)
+    # Schemas may define a richer `Detail` for single-record reads
+    Detail = getattr(schema, 'Detail', schema.Read)
 
-    @app.get(f"/{model_name}/{{item_id}}")
-    def read_endpoint(item_id: int, db: Session = Depends(get_db)) -> schema.Read:
+    @app.get(f"/{model_name}/{{item_id}}", dependencies=[Depends(admit('detail'))])
+    def read_endpoint(item_id: int, db: Session = Depends(get_read_db)) -> Detail:
         item = crud_op.read(db=db, obj_id=item_id)
         if item is None:
             raise HTTPException(status_code=404, detail=f"{model_name.capitalize()} not found")
         return item
 
-    @app.put(f"/{model_name}/{{item_id}}")
-    def update_endpoint(item_id: int, item: schema.Create, db: Session = Depends(get_db)) -> schema.Read:
+    @app.put(f"/{model_name}/{{item_id}}", dependencies=[Depends(admit('write'))])
+    def update_endpoint(item_id: int, item: schema.Create, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> schema.Read:
         updated_item = crud_op.update(db=db, obj_id=item_id, obj_in=item)
         if updated_item is None:
             raise HTTPException(status_code=404, detail=f"{model_name.capitalize()} not found")
+        after_write(background_tasks)
         return updated_item
 
-    @app.delete(f"/{model_name}/{{item_id}}")
-    def delete_endpoint(item_id: int, db: Session = Depends(get_db)) -> schema.Read:
+    @app.delete(f"/{model_name}/{{item_id}}", dependencies=[Depends(admit('write'))])
+    def delete_endpoint(item_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> schema.Read:
         deleted_item = crud_op.delete(db=db, obj_id=item_id)
         if deleted_item is None:
             raise HTTPException(status_code=404, detail=f"{model_name.capitalize()} not found")
+        after_write(background_tasks)
         return deleted_item
 
 # Generate CRUD routes for each model
 generate_crud_routes(app, "resumes", schema.resume, crud.resume)
-generate_crud_routes(app, "postings", schema.posting, crud.posting)
-generate_crud_routes(app, "applications", schema.application, crud.application)
-generate_crud_routes(app, "response_types", schema.response_type, crud.response_type)
-generate_crud_routes(app, "responses", schema.response, crud.response)
+generate_crud_routes(app, "postings", schema.posting, crud.posting, on_write=analytics.refresh_funnel_in_background)
+generate_crud_routes(app, "applications", schema.application, crud.application, on_write=analytics.refresh_funnel_in_background)
+generate_crud_routes(app, "response_types", schema.response_type, crud.response_type, on_write=analytics.refresh_funnel_in_background)
+generate_crud_routes(app, "responses", schema.response, crud.response, on_write=analytics.refresh_funnel_in_background)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+# app/admission.py
+from collections import deque
+from fastapi import APIRouter, Response
+from src.settings import admission_capacity, admission_classes
+import asyncio
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["metrics"])
+
+
+class Overloaded(Exception):
+    def __init__(self, route_class: str, reason: str, retry_after: int):
+        self.route_class = route_class
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"{route_class} requests are being shed ({reason})")
+
+
+class RouteClass:
+    """
+    Admission state of one class of routes.
+
+    Attributes:
+        priority (int): Waiting requests of lower priorities are admitted first.
+        limit (int): Requests of this class allowed to run at once.
+        queue_size (int): Requests allowed to wait; arrivals beyond it are shed immediately.
+        deadline (float): Seconds a request may wait before it is shed.
+    """
+    def __init__(self, name: str, priority: int, limit: int, queue_size: int, deadline: float):
+        self.name = name
+        self.priority = priority
+        self.limit = limit
+        self.queue_size = queue_size
+        self.deadline = deadline
+        self.queue: deque[asyncio.Future] = deque()
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = {'queue_full': 0, 'deadline': 0}
+
+    @property
+    def waiting(self) -> int:
+        return len(self.queue)
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.deadline))
+
+
+class AdmissionController:
+    """
+    Limits how many requests reach the database pool at once.
+
+    Every request holds one of `capacity` shared slots and one of its route class's slots.
+    When either is taken it waits in its class's bounded queue; freed slots go to the
+    highest-priority class with a waiter that fits. Requests are shed with `Overloaded`
+    when their queue is full or their deadline passes. Runs on the event loop only.
+    """
+    def __init__(self, capacity: int, classes: dict[str, tuple]):
+        self.capacity = capacity
+        self.in_flight = 0
+        self.classes = {name: RouteClass(name, *spec) for name, spec in classes.items()}
+        self._by_priority = sorted(self.classes.values(), key=lambda route_class: route_class.priority)
+
+    def _can_admit(self, route_class: RouteClass) -> bool:
+        return self.in_flight < self.capacity and route_class.in_flight < route_class.limit
+
+    def _admit(self, route_class: RouteClass):
+        self.in_flight += 1
+        route_class.in_flight += 1
+        route_class.admitted += 1
+
+    def _shed(self, route_class: RouteClass, reason: str):
+        route_class.shed[reason] += 1
+        logger.warning(f'shed {route_class.name} request: {reason} '
+                       f'({route_class.in_flight} in flight, {route_class.waiting} waiting)')
+        raise Overloaded(route_class.name, reason, route_class.retry_after)
+
+    async def acquire(self, name: str):
+        route_class = self.classes[name]
+        # Requests already waiting in this class go first
+        if not route_class.waiting and self._can_admit(route_class):
+            self._admit(route_class)
+            return
+        if route_class.waiting >= route_class.queue_size:
+            self._shed(route_class, 'queue_full')
+
+        future = asyncio.get_running_loop().create_future()
+        route_class.queue.append(future)
+        try:
+            await asyncio.wait_for(future, route_class.deadline)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                return  # Admitted just as the deadline passed
+            self._dequeue(route_class, future)
+            self._shed(route_class, 'deadline')
+        except asyncio.CancelledError:
+            # The client went away; hand back a slot granted in the meantime
+            if future.done() and not future.cancelled():
+                self.release(name)
+            else:
+                self._dequeue(route_class, future)
+            raise
+
+    @staticmethod
+    def _dequeue(route_class: RouteClass, future: asyncio.Future):
+        # `_dispatch` may already have popped the future once wait_for cancelled it
+        if future in route_class.queue:
+            route_class.queue.remove(future)
+
+    def release(self, name: str):
+        route_class = self.classes[name]
+        self.in_flight -= 1
+        route_class.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        for route_class in self._by_priority:
+            while route_class.queue and self._can_admit(route_class):
+                future = route_class.queue.popleft()
+                if not future.done():
+                    self._admit(route_class)
+                    future.set_result(None)
+
+    def metrics(self) -> str:
+        """Prometheus text exposition of the admission state."""
+        lines = [
+            '# TYPE admission_in_flight gauge',
+            *(f'admission_in_flight{{route_class="{c.name}"}} {c.in_flight}' for c in self._by_priority),
+            '# TYPE admission_queue_depth gauge',
+            *(f'admission_queue_depth{{route_class="{c.name}"}} {c.waiting}' for c in self._by_priority),
+            '# TYPE admission_admitted_total counter',
+            *(f'admission_admitted_total{{route_class="{c.name}"}} {c.admitted}' for c in self._by_priority),
+            '# TYPE admission_shed_total counter',
+            *(f'admission_shed_total{{route_class="{c.name}",reason="{reason}"}} {count}'
+              for c in self._by_priority for reason, count in c.shed.items()),
+        ]
+        return '\n'.join(lines) + '\n'
+
+controller = AdmissionController(admission_capacity, admission_classes)
+
+
+def admit(route_class: str):
+    """Dependency factory holding an admission slot of `route_class` for the duration of the request."""
+    async def admission():
+        await controller.acquire(route_class)
+        try:
+            yield
+        finally:
+            controller.release(route_class)
+    return admission
+
+
+@router.get("/metrics")
+def read_metrics():
+    return Response(controller.metrics(), media_type='text/plain; version=0.0.4')
@@ -0,0 +1,93 @@
+# app/analytics.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from src.database import SessionLocal
+from src.dependancies import get_db, get_read_db
+from src.admission import admit
+import src.schemas as schema
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+# Refreshed in this order; the summaries read from `funnel_application`
+FUNNEL_VIEWS = ('funnel_application', 'funnel_summary', 'funnel_by_response_type')
+FUNNEL_DIMENSIONS = ('overall', 'platform', 'company', 'resume')
+
+
+def refresh_funnel(db: Session):
+    for view in FUNNEL_VIEWS:
+        db.execute(text(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {view}'))
+    db.commit()
+
+
+class FunnelRefresher:
+    """
+    Debounced background refresh of the funnel views.
+
+    Writes only mark the views dirty; at most one refresh runs at a time and it
+    repeats until no write arrived during the previous pass, so bursts of writes
+    collapse into a couple of refreshes.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def __call__(self):
+        self._dirty = True
+        while self._dirty and self._lock.acquire(blocking=False):
+            try:
+                while self._dirty:
+                    self._dirty = False
+                    self._refresh()
+            finally:
+                self._lock.release()
+
+    def _refresh(self):
+        db = SessionLocal()
+        try:
+            refresh_funnel(db)
+        except Exception:
+            logger.exception('funnel refresh failed')
+        finally:
+            db.close()
+
+refresh_funnel_in_background = FunnelRefresher()
+
+
+@router.get("/funnel", dependencies=[Depends(admit('list'))])
+def read_funnel_overall(db: Session = Depends(get_read_db)) -> schema.analytics.FunnelRow:
+    return read_funnel(dimension='overall', db=db)[0]
+
+@router.get("/funnel/response_types", dependencies=[Depends(admit('list'))])
+def read_funnel_by_response_type(db: Session = Depends(get_read_db)) -> list[schema.analytics.ResponseTypeConversion]:
+    rows = db.execute(text('''
+        SELECT response_type_id, response_type, applications, interviewed,
+               COALESCE(interviewed::FLOAT / NULLIF(applications, 0), 0) AS interview_rate
+        FROM funnel_by_response_type
+        ORDER BY response_type_id
+    '''))
+    return rows.mappings().all()
+
+@router.get("/funnel/{dimension}", dependencies=[Depends(admit('list'))])
+def read_funnel(dimension: str, db: Session = Depends(get_read_db)) -> list[schema.analytics.FunnelRow]:
+    if dimension not in FUNNEL_DIMENSIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown funnel dimension: {dimension}")
+
+    rows = db.execute(text('''
+        SELECT dimension, key, applications, responded, interviewed, median_days_to_response,
+               COALESCE(responded::FLOAT / NULLIF(applications, 0), 0) AS response_rate,
+               COALESCE(interviewed::FLOAT / NULLIF(applications, 0), 0) AS interview_rate
+        FROM funnel_summary
+        WHERE dimension = :dimension
+        ORDER BY applications DESC, key
+    '''), {'dimension': dimension})
+    return rows.mappings().all()
+
+@router.post("/funnel/refresh", dependencies=[Depends(admit('write'))])
+def refresh_funnel_endpoint(db: Session = Depends(get_db)) -> dict:
+    refresh_funnel(db)
+    return {'refreshed': list(FUNNEL_VIEWS)}
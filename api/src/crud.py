@@ -1,7 +1,8 @@
 # app/crud.py
+from sqlalchemy import String, cast, func, text
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import NoResultFound
+from sqlalchemy.exc import NoResultFound, IntegrityError
 import src.schemas as schema
 import src.models as model
 
@@ -10,8 +11,12 @@ class CRUDBase:
     def __init__(self, _model):
         self.model = _model
 
+    # Maps an input schema to model columns; overridden where they differ
+    def to_columns(self, db: Session | AsyncSession, obj_in) -> dict:
+        return obj_in.dict()
+
     def create(self, db: Session | AsyncSession, obj_in):
-        db_obj = self.model(**obj_in.dict())
+        db_obj = self.model(**self.to_columns(db, obj_in))
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
@@ -26,10 +31,72 @@ class CRUDBase:
     def read_all(self, db: Session | AsyncSession):
         return db.query(self.model).all()
 
+    def read_page(
+        self,
+        db: Session | AsyncSession,
+        offset: int = 0,
+        limit: int | None = None,
+        sort: str | None = None,
+        descending: bool = False,
+        filter_field: str | None = None,
+        filter_value: str | None = None,
+    ):
+        """Return one sorted, filtered page of rows and the total number of matching rows."""
+        query = db.query(self.model)
+        if filter_field and filter_value:
+            column = self.column(filter_field)
+            query = query.filter(func.lower(cast(column, String)).contains(filter_value.lower(), autoescape=True))
+
+        order = self.column(sort) if sort else self.model.id
+        order_by = [order.desc() if descending else order.asc()]
+        if order is not self.model.id:
+            order_by.append(self.model.id)  # Stable paging across equal sort keys
+
+        items = query.order_by(*order_by).offset(offset).limit(limit).all()
+        # Counting is skipped when the page is provably the last one
+        is_last_page = (limit is None or len(items) < limit) and (items or not offset)
+        total = offset + len(items) if is_last_page else query.count()
+        return items, total
+
+    def changes(self, db: Session | AsyncSession, since: int = 0):
+        """Rows inserted or updated, and ids deleted, at row version `since` or later."""
+        postgres = db.get_bind().dialect.name == 'postgresql'
+        if postgres:
+            # Both reads see one snapshot, whose xmin is the next cursor: every transaction below it
+            # has finished, so one that commits late is never skipped. Rows written at or above it
+            # may be sent again by the next sync, which replicas apply idempotently.
+            db.connection(execution_options={'isolation_level': 'REPEATABLE READ'})
+            version = db.scalar(text('SELECT pg_snapshot_xmin(pg_current_snapshot())::TEXT::BIGINT'))
+        upserted = db.query(self.model).filter(self.model.version >= since).order_by(self.model.version).all()
+        tombstones = (
+            db.query(model.Tombstone)
+            .filter(model.Tombstone.table_name == self.model.__tablename__, model.Tombstone.version >= since)
+            .all()
+        )
+        if not postgres:
+            version = max([since] + [row.version + 1 for row in upserted] + [t.version + 1 for t in tombstones])
+        return {'version': version, 'upserted': upserted, 'deleted': [t.row_id for t in tombstones]}
+
+    def search(self, db: Session | AsyncSession, field: str, prefix: str = '', limit: int = 20):
+        """Case-insensitive prefix search on a single column, capped at `limit` rows."""
+        column = self.column(field)
+        # Text columns are compared uncast so `lower(column) text_pattern_ops` indexes apply
+        searchable = column if isinstance(column.type, String) else cast(column, String)
+        query = db.query(self.model)
+        if prefix:
+            query = query.filter(func.lower(searchable).startswith(prefix.lower(), autoescape=True))
+        return query.order_by(self.model.id).limit(limit).all()
+
+    def column(self, field: str):
+        try:
+            return self.model.__table__.columns[field]
+        except KeyError:
+            raise ValueError(f"{self.model.__name__} has no field '{field}'")
+
     def update(self, db: Session | AsyncSession, obj_id: int, obj_in):
         db_obj = db.query(self.model).filter(self.model.id == obj_id).one()
         if db_obj:
-            for key, value in obj_in.dict().items():
+            for key, value in self.to_columns(db, obj_in).items():
                 setattr(db_obj, key, value)
             db.commit()
             db.refresh(db_obj)
@@ -43,8 +110,74 @@ class CRUDBase:
         return db_obj
 
 
-resume = CRUDBase(model.Resume)
+class ResumeCRUD(CRUDBase):
+    """Resumes reference content-addressed blobs; identical content is stored once."""
+    preview_length = 80
+
+    def to_columns(self, db: Session | AsyncSession, obj_in) -> dict:
+        blob = self.store_blob(db, obj_in.data.encode('utf-8'))
+        preview = ' '.join(obj_in.data.split())[:self.preview_length]
+        return {'digest': blob.digest, 'size': blob.size, 'preview': preview}
+
+    def store_blob(self, db: Session | AsyncSession, content: bytes):
+        candidate = model.ResumeBlob.from_content(content)
+        blob = db.get(model.ResumeBlob, candidate.digest)
+        if blob is not None:
+            return blob
+        try:
+            # A concurrent writer may store the same digest first; the savepoint keeps the transaction usable
+            with db.begin_nested():
+                db.add(candidate)
+        except IntegrityError:
+            return db.get(model.ResumeBlob, candidate.digest)
+        return candidate
+
+
+class PartitionArchived(Exception):
+    def __init__(self, table_name: str, year: int):
+        self.table_name = table_name
+        self.year = year
+        super().__init__(f"{table_name} rows of {year} are archived and can no longer be written")
+
+
+class PartitionedCRUD(CRUDBase):
+    """Rows of a table range partitioned by year on a date column; missing partitions are created on demand."""
+    def __init__(self, _model, partition_key: str):
+        super().__init__(_model)
+        self.partition_key = partition_key
+
+    def create(self, db: Session | AsyncSession, obj_in):
+        try:
+            return super().create(db, obj_in)
+        except IntegrityError as e:
+            self.recover_missing_partition(db, e, obj_in)
+        return super().create(db, obj_in)
+
+    def update(self, db: Session | AsyncSession, obj_id: int, obj_in):
+        try:
+            return super().update(db, obj_id, obj_in)
+        except IntegrityError as e:
+            self.recover_missing_partition(db, e, obj_in)
+        return super().update(db, obj_id, obj_in)
+
+    def recover_missing_partition(self, db: Session | AsyncSession, error: IntegrityError, obj_in):
+        # Postgres reports rows outside every partition as a check violation
+        db.rollback()
+        if getattr(error.orig, 'pgcode', None) != '23514' or 'no partition' not in str(error.orig):
+            raise error
+        day = getattr(obj_in, self.partition_key)
+        try:
+            db.execute(text('SELECT ensure_partition(:table, :day)'), {'table': self.model.__tablename__, 'day': day})
+        except IntegrityError as e:
+            db.rollback()
+            if getattr(e.orig, 'pgcode', None) == '23514' and 'is archived' in str(e.orig):
+                raise PartitionArchived(self.model.__tablename__, day.year)
+            raise
+        db.commit()
+
+
+resume = ResumeCRUD(model.Resume)
 posting = CRUDBase(model.JobPosting)
-application = CRUDBase(model.JobApplication)
+application = PartitionedCRUD(model.JobApplication, partition_key='date_submitted')
 response_type = CRUDBase(model.ResponseType)
-response = CRUDBase(model.Response)
+response = PartitionedCRUD(model.Response, partition_key='date_received')
@@ -1,9 +1,17 @@
 # ./core/database.py
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from fastapi import HTTPException, status
-from src.settings import dbconn_config
+from src.settings import dbconn_config, database_url, replica_urls, replica_strategy, replica_health_interval
+import itertools
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class UnreachableDatabase(Exception):
@@ -12,7 +20,7 @@ class UnreachableDatabase(Exception):
         super().__init__(self.message)
 
 # Database session
-SQLALCHEMY_DATABASE_URL = 'postgresql://{username}:{password}@{hostname}:{port}/{database}'.format(**dbconn_config)
+SQLALCHEMY_DATABASE_URL = database_url
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -24,3 +32,71 @@ AsyncSessionLocal = sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False
 )
+
+
+class ReplicaPool:
+    """
+    Read replica engines, chosen per session by round robin or least connections.
+
+    A daemon thread probes every replica with `SELECT 1` each `health_interval` seconds.
+    Replicas that fail a probe, or a query, are skipped until a probe succeeds again.
+    `acquire` returns None when no replica is usable, so callers fall back to the primary.
+    """
+    strategies = ('round_robin', 'least_connections')
+
+    def __init__(self, urls: list[str], strategy: str = 'round_robin', health_interval: float = 5.0):
+        if strategy not in self.strategies:
+            raise ValueError(f"Unknown replica strategy '{strategy}', expected one of {self.strategies}")
+        self.engines = [create_engine(url, pool_pre_ping=True) for url in urls]
+        self.strategy = strategy
+        self.health_interval = health_interval
+        self.healthy = set(self.engines)
+        self.in_use = {engine: 0 for engine in self.engines}
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        if self.engines:
+            threading.Thread(target=self._monitor, name='replica-health', daemon=True).start()
+
+    def acquire(self) -> Engine | None:
+        with self._lock:
+            candidates = [engine for engine in self.engines if engine in self.healthy]
+            if not candidates:
+                return None
+            if self.strategy == 'least_connections':
+                engine = min(candidates, key=self.in_use.__getitem__)
+            else:
+                engine = candidates[next(self._turn) % len(candidates)]
+            self.in_use[engine] += 1
+            return engine
+
+    def release(self, engine: Engine):
+        with self._lock:
+            self.in_use[engine] -= 1
+
+    def mark_unhealthy(self, engine: Engine):
+        with self._lock:
+            if engine in self.healthy:
+                logger.warning(f'replica {engine.url!r} is unhealthy, routing reads elsewhere')
+            self.healthy.discard(engine)
+
+    def check(self):
+        for engine in self.engines:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text('SELECT 1'))
+            except SQLAlchemyError:
+                self.mark_unhealthy(engine)
+                continue
+            with self._lock:
+                if engine not in self.healthy:
+                    logger.info(f'replica {engine.url!r} is healthy again')
+                    self.healthy.add(engine)
+
+    def _monitor(self):
+        while True:
+            self.check()
+            time.sleep(self.health_interval)
+
+# Read-only sessions are bound to a replica engine when created
+replicas = ReplicaPool(replica_urls, strategy=replica_strategy, health_interval=replica_health_interval)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
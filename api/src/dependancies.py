@@ -1,6 +1,10 @@
-from src.database import SessionLocal, AsyncSessionLocal, UnreachableDatabase
+from fastapi import Request
+from src.database import SessionLocal, ReadSessionLocal, AsyncSessionLocal, UnreachableDatabase, replicas
 from sqlalchemy.exc import OperationalError
 
+# Set on write responses; while present the client's reads go to the primary
+READ_PRIMARY_COOKIE = 'read_primary'
+
 
 # Database dependency yielder
 def get_db():
@@ -12,6 +16,23 @@ def get_db():
     finally:
         db.close()
 
+# Read-only database dependency yielder, served by a replica unless the client wrote recently
+def get_read_db(request: Request):
+    engine = None if request.cookies.get(READ_PRIMARY_COOKIE) else replicas.acquire()
+    if engine is None:
+        yield from get_db()
+        return
+
+    db = ReadSessionLocal(bind=engine)
+    try:
+        yield db
+    except OperationalError as e:
+        replicas.mark_unhealthy(engine)
+        raise UnreachableDatabase() from e
+    finally:
+        db.close()
+        replicas.release(engine)
+
 # Database async dependency yielder
 async def get_async_db():
     db = AsyncSessionLocal()
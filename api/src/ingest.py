@@ -0,0 +1,402 @@
+# app/ingest.py
+#
+# Imports recruiter emails from a local mbox file or Maildir as responses:
+#
+#   python -m src.ingest path/to/inbox.mbox [--workers N] [--batch-size N] [--checkpoint FILE]
+#
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date
+from email import policy
+from email.errors import HeaderParseError
+from email.header import decode_header, make_header
+from email.message import Message
+from email.parser import BytesParser
+from email.utils import parseaddr, parsedate_to_datetime
+from hashlib import sha256
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from src.analytics import refresh_funnel
+from src.database import SessionLocal
+from src.settings import ingest_batch_size, ingest_workers
+import src.models as model
+import argparse
+import json
+import os
+import re
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Only the start of a body is kept; it is enough to match and classify a message
+BODY_LIMIT = 20_000
+SNIPPET_LENGTH = 500
+
+# Checked in order, the first matching response type wins; otherwise the message is a plain email
+RESPONSE_TYPE_PATTERNS = (
+    ('interview', re.compile(r'\binterview|\bon-?site\b|meet (?:with )?the (?:team|hiring manager)', re.IGNORECASE)),
+    ('takehome', re.compile(r'take[- ]?home|coding (?:challenge|exercise|assignment|test)|\bassessment\b', re.IGNORECASE)),
+    ('call', re.compile(r'phone screen|\bcall\b', re.IGNORECASE)),
+)
+DEFAULT_RESPONSE_TYPE = 'email'
+
+# Legal suffixes ignored when looking for a company name
+COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company', 'gmbh', 'plc', 'ag', 'group'}
+
+
+# Mailbox readers yield `(raw_message, position)`, where `position` is where to resume after that message
+def read_mbox(path: str, position: int = 0):
+    """Stream an mbox file one message at a time; positions are byte offsets."""
+    with open(path, 'rb') as file:
+        file.seek(position)
+        offset = position
+        lines = None
+        for line in file:
+            if line.startswith(b'From '):
+                if lines is not None:
+                    yield b''.join(lines), offset
+                lines = []
+            elif lines is not None:
+                # mboxrd quotes body lines starting with "From "
+                lines.append(line[1:] if re.match(rb'>+From ', line) else line)
+            offset += len(line)
+        if lines is not None:
+            yield b''.join(lines), offset
+
+def read_maildir(path: str, position: str = ''):
+    """Stream a Maildir's messages in file name (delivery) order; positions are file names."""
+    # The part before ':' stays the same when a client moves a message from new/ to cur/
+    names = sorted(
+        (name.split(':')[0], os.path.join(path, folder, name))
+        for folder in ('new', 'cur')
+        for name in os.listdir(os.path.join(path, folder))
+        if not name.startswith('.')
+    )
+    for name, file_path in names:
+        if name > position:
+            with open(file_path, 'rb') as file:
+                yield file.read(), name
+
+
+def normalize(value: str) -> str:
+    return ' '.join(re.findall(r'[a-z0-9]+', value.lower()))
+
+def decoded_header(message: Message, name: str) -> str:
+    value = message.get(name)
+    try:
+        return str(make_header(decode_header(value))) if value else ''
+    except (HeaderParseError, LookupError, UnicodeError):
+        return str(value)
+
+def body_text(message: Message) -> str:
+    """The first plain text part of a message, falling back to its first HTML part with tags stripped."""
+    parts = {}
+    for part in message.walk():
+        if part.get_content_type() in ('text/plain', 'text/html') and part.get_content_disposition() != 'attachment':
+            parts.setdefault(part.get_content_type(), part)
+    part = parts.get('text/plain') or parts.get('text/html')
+    if part is None:
+        return ''
+
+    payload = (part.get_payload(decode=True) or b'')[:BODY_LIMIT]
+    try:
+        content = payload.decode(part.get_content_charset() or 'utf-8', errors='replace')
+    except LookupError:
+        content = payload.decode('utf-8', errors='replace')
+    return re.sub(r'<[^>]+>', ' ', content) if part.get_content_type() == 'text/html' else content
+
+def parse_message(raw: bytes) -> dict:
+    # The legacy compat32 policy parses several times faster than `policy.default`
+    message = BytesParser(policy=policy.compat32).parsebytes(raw)
+    # Messages without a Message-ID are keyed on their content, which is just as stable
+    message_id = str(message.get('Message-ID', '')).strip() or f'<sha256:{sha256(raw).hexdigest()}>'
+    try:
+        received = parsedate_to_datetime(str(message['Date'])).date()
+    except (TypeError, ValueError):
+        received = None
+
+    sender, address = parseaddr(decoded_header(message, 'From'))
+    return {
+        'message_id': message_id,
+        'date': received,
+        'sender': sender,
+        'domain': address.rpartition('@')[2].lower(),
+        'subject': decoded_header(message, 'Subject'),
+        'body': ' '.join(body_text(message).split()),
+    }
+
+
+class ApplicationMatcher:
+    """
+    Matches messages to applications by company name and posting title.
+
+    A company scores when it appears in the sender's domain (3), the sender's name (2), the
+    subject (2) or the body (1); its applications score one more when most words of the
+    posting title are in the subject. The best application submitted on or before the
+    message's date wins, ties going to the most recent; below `min_score` nothing matches.
+    """
+    min_score = 2
+
+    def __init__(self, applications: list[tuple]):
+        # `(id, company, title, date_submitted)` rows, grouped by normalized company name
+        self.companies: dict[str, list[tuple]] = {}
+        for application_id, company, title, submitted in applications:
+            key = ' '.join(word for word in normalize(company).split() if word not in COMPANY_SUFFIXES)
+            if key:
+                self.companies.setdefault(key, []).append((application_id, set(normalize(title).split()), submitted))
+
+    def match(self, message: dict) -> int | None:
+        labels = [label.replace('-', '') for label in message['domain'].split('.')]
+        texts = (
+            (f" {normalize(message['sender'])} ", 2),
+            (f" {normalize(message['subject'])} ", 2),
+            (f" {normalize(message['body'])} ", 1),
+        )
+        subject_words = set(texts[1][0].split())
+
+        best = None
+        for key, applications in self.companies.items():
+            compact = key.replace(' ', '')
+            score = 3 if len(compact) >= 3 and any(compact in label for label in labels) else 0
+            score += sum(weight for text, weight in texts if f' {key} ' in text)
+            if not score:
+                continue
+            for application_id, title_words, submitted in applications:
+                if message['date'] and submitted > message['date']:
+                    continue
+                title_score = 1 if title_words and 2 * len(title_words & subject_words) >= len(title_words) else 0
+                candidate = (score + title_score, submitted, application_id)
+                best = max(best, candidate) if best else candidate
+
+        return best[2] if best and best[0] >= self.min_score else None
+
+def classify(message: dict, response_types: dict[str, int]) -> int | None:
+    content = f"{message['subject']}\n{message['body']}"
+    for name, pattern in RESPONSE_TYPE_PATTERNS:
+        if name in response_types and pattern.search(content):
+            return response_types[name]
+    return response_types.get(DEFAULT_RESPONSE_TYPE)
+
+
+# Worker process state, set once per worker by `_init_worker`
+_matcher: ApplicationMatcher | None = None
+_response_types: dict[str, int] = {}
+
+def _init_worker(applications: list[tuple], response_types: dict[str, int]):
+    global _matcher, _response_types
+    _matcher = ApplicationMatcher(applications)
+    _response_types = response_types
+
+def process_batch(raw_messages: list[bytes]) -> list[dict | None]:
+    """Parse, match and classify a batch in a worker; unparseable messages come back as None."""
+    results = []
+    for raw in raw_messages:
+        try:
+            message = parse_message(raw)
+        except Exception:
+            results.append(None)
+            continue
+        message['application_id'] = _matcher.match(message)
+        message['response_type_id'] = classify(message, _response_types)
+        message['data'] = f"{message['subject']}\n\n{message.pop('body')[:SNIPPET_LENGTH]}".strip()
+        results.append(message)
+    return results
+
+
+class Checkpoint:
+    """Position after the last committed batch of a mailbox, kept in a JSON file so an interrupted import resumes there."""
+    def __init__(self, path: str, mailbox: str):
+        self.path = path
+        self.mailbox = mailbox
+
+    def load(self):
+        try:
+            with open(self.path) as file:
+                saved = json.load(file)
+        except FileNotFoundError:
+            return None
+        return saved['position'] if saved.get('mailbox') == self.mailbox else None
+
+    def save(self, position):
+        # Written atomically, so a crash leaves either the old or the new checkpoint
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump({'mailbox': self.mailbox, 'position': position}, file)
+        os.replace(temporary, self.path)
+
+
+class IngestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.messages = 0
+        self.bytes = 0
+        self.new = 0
+        self.matched = 0
+        self.archived = 0
+        self.failed = 0
+
+    def log(self, final: bool = False):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        logger.info(
+            f"{'ingested' if final else 'progress'}: {self.messages} messages in {elapsed:.1f}s "
+            f"({self.messages / elapsed:.0f} msg/s, {self.bytes / elapsed / 2**20:.1f} MiB/s), "
+            f"{self.new} new, {self.matched} matched, {self.messages - self.new - self.failed} already ingested, "
+            f"{self.archived} dated in archived years, {self.failed} unparseable"
+        )
+
+
+class MailboxIngestion:
+    """
+    Imports one mailbox: a reader streams raw messages in batches to a worker pool, and results
+    are written back in mailbox order, one transaction per batch.
+
+    Each batch records its messages in `ingested_message` and bulk inserts a `response` for every
+    newly matched one, then advances the checkpoint. Message-IDs already matched are skipped, so
+    re-running an import (e.g. after adding the missing applications) is safe.
+    """
+    def __init__(self, mailbox: str, checkpoint_path: str | None = None, workers: int = ingest_workers, batch_size: int = ingest_batch_size):
+        self.mailbox = os.path.abspath(mailbox)
+        self.checkpoint = Checkpoint(checkpoint_path or f"{self.mailbox.rstrip('/')}.checkpoint", self.mailbox)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.stats = IngestStats()
+        self.archived_years: set[int] = set()
+
+    def _batches(self):
+        reader = read_maildir if os.path.isdir(self.mailbox) else read_mbox
+        position = self.checkpoint.load()
+        if position is not None:
+            logger.info(f'resuming {self.mailbox} from {position!r}')
+        messages = reader(self.mailbox) if position is None else reader(self.mailbox, position)
+
+        batch = []
+        for raw, position in messages:
+            batch.append(raw)
+            if len(batch) == self.batch_size:
+                yield batch, position
+                batch = []
+        if batch:
+            yield batch, position
+
+    def run(self) -> IngestStats:
+        db = SessionLocal()
+        try:
+            applications, response_types = self._reference_data(db)
+            # Archived partitions reject writes, so responses dated in them are left out
+            self.archived_years = {
+                start.year for start in
+                db.scalars(select(model.ArchivedPartition.range_start).where(model.ArchivedPartition.table_name == 'response'))
+            }
+            with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(applications, response_types)) as pool:
+                # A bounded window of batches in flight keeps the workers busy without reading the whole mailbox ahead
+                pending: deque[tuple[Future, object, int]] = deque()
+                for batch, position in self._batches():
+                    pending.append((pool.submit(process_batch, batch), position, sum(map(len, batch))))
+                    if len(pending) >= 2 * self.workers:
+                        self._write(db, *pending.popleft())
+                while pending:
+                    self._write(db, *pending.popleft())
+
+            if self.stats.matched:
+                refresh_funnel(db)
+        finally:
+            db.close()
+        self.stats.log(final=True)
+        return self.stats
+
+    def _reference_data(self, db: Session):
+        applications = db.execute(
+            select(model.JobApplication.id, model.JobPosting.company, model.JobPosting.title, model.JobApplication.date_submitted)
+            .join(model.JobPosting, model.JobApplication.posting_id == model.JobPosting.id)
+        ).all()
+        response_types = {row.name: row.id for row in db.query(model.ResponseType)}
+        return [tuple(row) for row in applications], response_types
+
+    def _write(self, db: Session, future: Future, position, size: int):
+        results = future.result()
+        self.stats.messages += len(results)
+        self.stats.bytes += size
+        self.stats.failed += results.count(None)
+
+        # Duplicates within a batch are dropped first; one statement cannot update a row twice
+        messages = {}
+        for message in filter(None, results):
+            messages.setdefault(message['message_id'], message)
+
+        if messages:
+            # A message records its application only along with a response. One that matched but
+            # cannot get one (e.g. it has no Date) stays unmatched, so a later import can claim it.
+            answerable = {message_id for message_id, message in messages.items() if self._answerable(message)}
+
+            # New messages, and previously unmatched ones that match now, are claimed for this import
+            statement = pg_insert(model.IngestedMessage).values([
+                {
+                    'message_id': message['message_id'],
+                    'mailbox': self.mailbox,
+                    'application_id': message['application_id'] if message['message_id'] in answerable else None,
+                    'response_type_id': message['response_type_id'],
+                    'date_received': message['date'],
+                }
+                for message in messages.values()
+            ])
+            statement = statement.on_conflict_do_update(
+                index_elements=[model.IngestedMessage.message_id],
+                set_={
+                    'mailbox': statement.excluded.mailbox,
+                    'application_id': statement.excluded.application_id,
+                    'response_type_id': statement.excluded.response_type_id,
+                    'date_received': statement.excluded.date_received,
+                    'ingested_at': text('now()'),
+                },
+                where=model.IngestedMessage.application_id.is_(None) & statement.excluded.application_id.is_not(None),
+            )
+            claimed = set(db.scalars(statement.returning(model.IngestedMessage.message_id)))
+
+            responses = [
+                {
+                    'application_id': message['application_id'],
+                    'response_type_id': message['response_type_id'],
+                    'date_received': message['date'],
+                    'data': message['data'],
+                }
+                for message_id, message in messages.items()
+                if message_id in claimed and message_id in answerable
+            ]
+            self.stats.archived += sum(
+                1 for message_id in claimed
+                if messages[message_id]['application_id'] and messages[message_id]['date']
+                and messages[message_id]['date'].year in self.archived_years
+            )
+            for year in {response['date_received'].year for response in responses}:
+                db.execute(text('SELECT ensure_partition(:table, :day)'), {'table': 'response', 'day': date(year, 1, 1)})
+            if responses:
+                db.execute(insert(model.Response), responses)
+            db.commit()
+
+            self.stats.new += len(claimed)
+            self.stats.matched += len(responses)
+
+        self.checkpoint.save(position)
+        self.stats.log()
+
+    def _answerable(self, message: dict) -> bool:
+        """Whether a response can be written for the message; archived years reject writes."""
+        return bool(message['application_id'] and message['response_type_id'] and message['date']) \
+            and message['date'].year not in self.archived_years
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import recruiter emails from an mbox file or Maildir as responses.')
+    parser.add_argument('mailbox', help='Path to an mbox file or a Maildir directory')
+    parser.add_argument('--workers', type=int, default=ingest_workers, help='Parse/classify worker processes')
+    parser.add_argument('--batch-size', type=int, default=ingest_batch_size, help='Messages per batch and transaction')
+    parser.add_argument('--checkpoint', help='Checkpoint file (default: <mailbox>.checkpoint); delete it to re-scan the whole mailbox')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    MailboxIngestion(args.mailbox, args.checkpoint, workers=args.workers, batch_size=args.batch_size).run()
+
+if __name__ == '__main__':
+    main()
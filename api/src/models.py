@@ -1,17 +1,81 @@
 # src/models.py
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Date, JSON, Double
-from sqlalchemy.orm import relationship
+from hashlib import sha256
+import zlib
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Boolean, ForeignKey, Date, DateTime, Double, LargeBinary, FetchedValue, func, text
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
-class Resume(Base):
+class Versioned:
+    # Id of the last transaction writing the row, set by the `bump_row_version` trigger; see data/sql/schema.sql
+    version = Column(BigInteger, nullable=False, index=True, server_default=text('0'), server_onupdate=FetchedValue())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
+
+class Tombstone(Base):
+    # Written by the `record_tombstone` trigger when a versioned row is deleted
+    __tablename__ = "tombstone"
+
+    table_name = Column(String, primary_key=True)
+    row_id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, index=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+class ArchivedPartition(Base):
+    # Yearly partitions of `application`/`response` detached into the `archive` schema
+    __tablename__ = "archived_partition"
+
+    table_name = Column(String, primary_key=True)
+    partition_name = Column(String, nullable=False)
+    range_start = Column(Date, primary_key=True)
+    range_end = Column(Date, nullable=False)
+    row_count = Column(BigInteger, nullable=False)
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+class IngestedMessage(Base):
+    # Messages seen by the mailbox import; `application_id` is None when no application matched
+    __tablename__ = "ingested_message"
+
+    message_id = Column(String, primary_key=True)
+    mailbox = Column(String, nullable=False)
+    application_id = Column(Integer)
+    response_type_id = Column(Integer, ForeignKey("response_type.id"))
+    date_received = Column(Date)
+    ingested_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+class ResumeBlob(Base):
+    # Content-addressed: keyed by the sha256 of the uncompressed content, stored zlib-compressed
+    __tablename__ = "resume_blob"
+
+    digest = Column(String, primary_key=True)
+    size = Column(Integer, nullable=False)
+    compressed_size = Column(Integer, nullable=False)
+    content = deferred(Column(LargeBinary, nullable=False))
+
+    @classmethod
+    def from_content(cls, content: bytes):
+        compressed = zlib.compress(content)
+        return cls(digest=sha256(content).hexdigest(), size=len(content), compressed_size=len(compressed), content=compressed)
+
+    def decompressed(self) -> bytes:
+        return zlib.decompress(self.content)
+
+class Resume(Versioned, Base):
     __tablename__ = "resume"
 
     id = Column(Integer, primary_key=True, index=True)
-    data = Column(JSON, nullable=False)
+    digest = Column(String, ForeignKey("resume_blob.digest"), nullable=False, index=True)
+    size = Column(Integer, nullable=False)
+    preview = Column(String, nullable=False)
+
+    # Only loaded when the content is asked for, never for list reads
+    blob = relationship("ResumeBlob")
+
+    @property
+    def data(self) -> str:
+        return self.blob.decompressed().decode('utf-8')
 
-class JobPosting(Base):
+class JobPosting(Versioned, Base):
     __tablename__ = "posting"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -24,7 +88,7 @@ class JobPosting(Base):
     qualifications = Column(String)
     remote = Column(Boolean)
 
-class JobApplication(Base):
+class JobApplication(Versioned, Base):
     __tablename__ = "application"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -35,16 +99,17 @@ class JobApplication(Base):
     posting = relationship("JobPosting")
     resume = relationship("Resume")
 
-class ResponseType(Base):
+class ResponseType(Versioned, Base):
     __tablename__ = "response_type"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
 
-class Response(Base):
+class Response(Versioned, Base):
     __tablename__ = "response"
 
     id = Column(Integer, primary_key=True, index=True)
+    # Enforced by triggers in Postgres, where `application` is partitioned
     application_id = Column(Integer, ForeignKey("application.id"), nullable=False)
     response_type_id = Column(Integer, ForeignKey("response_type.id"), nullable=False)
     date_received = Column(Date, nullable=False)
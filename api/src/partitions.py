@@ -0,0 +1,105 @@
+# app/partitions.py
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import MetaData, func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from src.database import SessionLocal, engine
+from src.dependancies import get_db, get_read_db
+from src.admission import admit
+from src.settings import partition_years_ahead, partition_check_interval, archive_tablespace
+import src.schemas as schema
+import src.models as model
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/partitions", tags=["partitions"])
+
+# Endpoints of the partitioned tables, as registered by `generate_crud_routes`
+PARTITIONED = {
+    'applications': (model.JobApplication, schema.application),
+    'responses': (model.Response, schema.response),
+}
+
+
+def ensure_future_partitions(db: Session):
+    db.execute(text('SELECT ensure_future_partitions(:years_ahead)'), {'years_ahead': partition_years_ahead})
+    db.commit()
+
+
+class PartitionMaintainer:
+    """Creates upcoming yearly partitions ahead of time, so inserts rarely have to create one on demand."""
+    def __init__(self, interval: float):
+        self.interval = interval
+
+    def start(self):
+        # Partitioning is Postgres only; other engines (e.g. the SQLite files of the routing tests) have none
+        if engine.dialect.name == 'postgresql':
+            threading.Thread(target=self._run, name='partition-maintainer', daemon=True).start()
+
+    def _run(self):
+        while True:
+            db = SessionLocal()
+            try:
+                ensure_future_partitions(db)
+            except Exception:
+                logger.exception('creating future partitions failed')
+            finally:
+                db.close()
+            time.sleep(self.interval)
+
+partition_maintainer = PartitionMaintainer(partition_check_interval)
+
+
+def _lookup(model_name: str):
+    if model_name not in PARTITIONED:
+        raise HTTPException(status_code=404, detail=f"{model_name} is not partitioned")
+    return PARTITIONED[model_name]
+
+@router.get("/archive", dependencies=[Depends(admit('list'))])
+def read_archived_partitions(db: Session = Depends(get_read_db)) -> list[schema.archive.ArchivedPartition]:
+    return db.query(model.ArchivedPartition).order_by(model.ArchivedPartition.table_name, model.ArchivedPartition.range_start).all()
+
+@router.post("/archive/{model_name}/{year}", dependencies=[Depends(admit('write'))])
+def archive_partition(model_name: str, year: int, db: Session = Depends(get_db)) -> schema.archive.ArchivedPartition:
+    _model, _ = _lookup(model_name)
+    try:
+        db.execute(
+            text('SELECT archive_partition(:table, :year, :tablespace)'),
+            {'table': _model.__tablename__, 'year': year, 'tablespace': archive_tablespace}
+        )
+        db.commit()
+    except DBAPIError as e:
+        db.rollback()
+        pgcode = getattr(e.orig, 'pgcode', None)
+        if pgcode == '42P01':  # undefined_table
+            raise HTTPException(status_code=404, detail=f"No {model_name} partition for {year}")
+        if pgcode == '22023':  # invalid_parameter_value: the current or a future year
+            raise HTTPException(status_code=422, detail=e.orig.diag.message_primary)
+        if pgcode == '23503':  # foreign_key_violation: live responses still reference the year
+            raise HTTPException(status_code=409, detail=e.orig.diag.message_primary)
+        raise
+    return db.get(model.ArchivedPartition, (_model.__tablename__, f'{year}-01-01'))
+
+@router.get("/archive/{model_name}/{year}", dependencies=[Depends(admit('list'))])
+def read_archived_rows(
+    model_name: str,
+    year: int,
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
+) -> list:
+    """Rows of an archived partition, paged like the live list routes."""
+    _model, _schema = _lookup(model_name)
+    archived = db.get(model.ArchivedPartition, (_model.__tablename__, f'{year}-01-01'))
+    if archived is None:
+        raise HTTPException(status_code=404, detail=f"No archived {model_name} partition for {year}")
+
+    # Same columns as the live table, read from the detached partition
+    table = _model.__table__.to_metadata(MetaData(), schema='archive', name=archived.partition_name)
+    rows = db.execute(select(table).order_by(table.c.id).offset(offset).limit(limit)).mappings().all()
+    response.headers['X-Total-Count'] = str(db.scalar(select(func.count()).select_from(table)))
+    return [_schema.Read.model_validate(dict(row)) for row in rows]
@@ -0,0 +1,75 @@
+# app/resumes.py
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy.orm import Session
+from src.dependancies import get_read_db
+from src.admission import admit
+import src.crud as crud
+import re
+
+router = APIRouter(prefix="/resumes", tags=["resumes"])
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single `bytes=start-end` range into inclusive offsets.
+
+    Returns None for a header that is not a valid range, which RFC 7233 says to ignore, and
+    raises `RangeNotSatisfiable` for a valid range that selects no bytes of the content.
+    """
+    match = RANGE_PATTERN.match(range_header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+
+    start, end = match.groups()
+    if start == '':
+        # Suffix range: the last N bytes
+        length = int(end)
+        if not length or not size:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    if end and int(end) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(int(end), size - 1) if end else size - 1
+
+
+@router.get("/{item_id}/content", dependencies=[Depends(admit('detail'))])
+def read_resume_content(
+    item_id: int,
+    range: str | None = Header(None),
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    resume = crud.resume.read(db=db, obj_id=item_id)
+    if resume is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    # Content is addressed by its digest, so the digest is a strong ETag
+    headers = {'Accept-Ranges': 'bytes', 'ETag': f'"{resume.digest}"'}
+    if if_none_match == headers['ETag']:
+        return Response(status_code=304, headers=headers)
+
+    content = resume.blob.decompressed()
+    media_type = 'text/plain; charset=utf-8'
+    if range is None:
+        return Response(content, media_type=media_type, headers=headers)
+
+    try:
+        byte_range = parse_range(range, len(content))
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, 'Content-Range': f'bytes */{len(content)}'})
+    if byte_range is None:
+        return Response(content, media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers['Content-Range'] = f'bytes {start}-{end}/{len(content)}'
+    return Response(content[start:end + 1], status_code=206, media_type=media_type, headers=headers)
@@ -1,5 +1,8 @@
 from . import (
+    analytics,
+    archive,
     application,
+    changes,
     posting,
     response,
     response_type,
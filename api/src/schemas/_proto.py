@@ -6,3 +6,4 @@ from pydantic import BaseModel
 class SchemaProtocol(Protocol):
     Create: Type[BaseModel]
     Read: Type[BaseModel]
+    # Optional `Detail: Type[BaseModel]` is used for single-record reads when present
@@ -0,0 +1,20 @@
+# app/schemas/analytics.py
+from pydantic import BaseModel
+
+
+class FunnelRow(BaseModel):
+    dimension: str
+    key: str
+    applications: int
+    responded: int
+    interviewed: int
+    response_rate: float
+    interview_rate: float
+    median_days_to_response: float | None = None
+
+class ResponseTypeConversion(BaseModel):
+    response_type_id: int
+    response_type: str
+    applications: int
+    interviewed: int
+    interview_rate: float
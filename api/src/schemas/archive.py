@@ -0,0 +1,12 @@
+# app/schemas/archive.py
+from pydantic import BaseModel
+from datetime import date, datetime
+
+
+class ArchivedPartition(BaseModel):
+    table_name: str
+    partition_name: str
+    range_start: date
+    range_end: date
+    row_count: int
+    archived_at: datetime
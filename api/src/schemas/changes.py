@@ -0,0 +1,12 @@
+# app/schemas/changes.py
+from pydantic import BaseModel
+from typing import Generic, TypeVar
+
+ReadT = TypeVar('ReadT', bound=BaseModel)
+
+
+# Delta of a resource since a row version; `version` is the `since` cursor of the next request
+class Changes(BaseModel, Generic[ReadT]):
+    version: int
+    upserted: list[ReadT]
+    deleted: list[int]
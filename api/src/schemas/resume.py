@@ -9,5 +9,12 @@ class ResumeBase(BaseModel):
 class Create(ResumeBase):
     pass
 
-class Read(ResumeBase):
+# List reads carry only blob metadata; the content is served by detail reads and `/resumes/{id}/content`
+class Read(BaseModel):
     id: int
+    digest: str
+    size: int
+    preview: str
+
+class Detail(Read, ResumeBase):
+    pass
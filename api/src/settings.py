@@ -20,4 +20,35 @@ dbconn_config = {
     'database': 'apptracker'
 }
 
-hot_reload = True
\ No newline at end of file
+# Primary database for writes. Postgres only: data/sql/schema.sql relies on its triggers, partitions and materialized views
+database_url = get_env_var('DATABASE_URL', safe=True) or 'postgresql://{username}:{password}@{hostname}:{port}/{database}'.format(**dbconn_config)
+
+# Comma separated read replica URLs (streaming replicas of the primary); reads use the primary when none are configured or healthy
+replica_urls = [url.strip() for url in (get_env_var('DATABASE_REPLICA_URLS', safe=True) or '').split(',') if url.strip()]
+replica_strategy = get_env_var('DATABASE_REPLICA_STRATEGY', safe=True) or 'round_robin'  # or 'least_connections'
+replica_health_interval = float(get_env_var('DATABASE_REPLICA_HEALTH_INTERVAL', safe=True) or 5)
+
+# Seconds after a write during which the same client's reads go to the primary, to cover replication lag
+read_your_writes_window = int(get_env_var('READ_YOUR_WRITES_WINDOW', safe=True) or 5)
+
+# Admission control in front of the connection pool. The shared capacity defaults to the size of
+# SQLAlchemy's default pool (5 connections plus 10 overflow).
+admission_capacity = int(get_env_var('ADMISSION_CAPACITY', safe=True) or 15)
+admission_classes = {
+    # route class: (priority, concurrency limit, queue size, queue deadline in seconds); lower priority is served first
+    'detail': (0, 15, 64, 2.0),
+    'write': (1, 8, 32, 5.0),
+    'list': (2, 6, 16, 5.0),
+}
+
+# Yearly partitions of `application`/`response` are kept this many years ahead, checked every interval (seconds)
+partition_years_ahead = 1
+partition_check_interval = 6 * 60 * 60
+# Tablespace archived partitions are moved to, e.g. one on compressed or cheaper storage
+archive_tablespace = get_env_var('ARCHIVE_TABLESPACE', safe=True)
+
+# Mailbox import: messages per parse/write batch and parse worker processes (default: one per CPU)
+ingest_batch_size = 500
+ingest_workers = int(get_env_var('INGEST_WORKERS', safe=True) or os.cpu_count() or 1)
+
+hot_reload = True
@@ -0,0 +1,34 @@
+# app/tests/test_admission.py
+import asyncio
+import pytest
+from src.admission import AdmissionController, Overloaded
+
+
+def test_expired_waiter_popped_by_dispatch():
+    async def scenario():
+        controller = AdmissionController(1, {'list': (1, 1, 4, 0.05)})
+        await controller.acquire('list')
+        waiter = asyncio.create_task(controller.acquire('list'))
+        await asyncio.sleep(0)
+        future = controller.classes['list'].queue[0]
+
+        # Release as soon as the deadline cancels the future, before the waiter handles it
+        while not future.cancelled():
+            await asyncio.sleep(0)
+        controller.release('list')
+        with pytest.raises(Overloaded):
+            await waiter
+        assert controller.in_flight == 0 and not controller.classes['list'].queue
+
+    asyncio.run(scenario())
+
+def test_waiter_shed_after_deadline():
+    async def scenario():
+        controller = AdmissionController(1, {'list': (1, 1, 4, 0.01)})
+        await controller.acquire('list')
+        with pytest.raises(Overloaded):
+            await controller.acquire('list')
+        assert controller.classes['list'].shed['deadline'] == 1
+        assert not controller.classes['list'].queue
+
+    asyncio.run(scenario())
@@ -0,0 +1,133 @@
+# app/tests/test_analytics.py
+#
+# Checks the funnel views against a naive recompute in Python (see conftest.py for the database)
+from collections import defaultdict
+from datetime import date, timedelta
+import random
+import statistics
+import pytest
+
+DIMENSIONS = ('overall', 'platform', 'company', 'resume')
+
+
+@pytest.fixture(scope='module')
+def seeded(client):
+    """Random applications and responses created through the API; returns them as the API echoed them."""
+    rng = random.Random(34)
+    response_types = {row['id']: row['name'] for row in client.get('/response_types/').json()}
+
+    resumes = [client.post('/resumes/', json={'data': f'resume {i}'}).json() for i in range(3)]
+    postings = {}
+    for i in range(8):
+        posting = client.post('/postings/', json={
+            'platform': rng.choice(['linkedin', 'indeed', 'referral']),
+            'company': rng.choice(['Acme', 'Globex', 'Initech', 'Umbrella']),
+            'title': f'Engineer {i}',
+            'responsibilities': 'r',
+            'qualifications': 'q',
+        }).json()
+        postings[posting['id']] = posting
+
+    applications, responses = [], []
+    for _ in range(60):
+        # Spans two years, so on-demand partition creation is exercised as well
+        submitted = date(2025, 6, 1) + timedelta(days=rng.randrange(365))
+        application = client.post('/applications/', json={
+            'posting_id': rng.choice(list(postings)),
+            'resume_id': rng.choice(resumes)['id'],
+            'date_submitted': submitted.isoformat(),
+        }).json()
+        applications.append(application)
+        for _ in range(rng.choice([0, 0, 1, 2, 3])):
+            responses.append(client.post('/responses/', json={
+                'application_id': application['id'],
+                'response_type_id': rng.choice(list(response_types)),
+                'date_received': (submitted + timedelta(days=rng.randrange(60))).isoformat(),
+            }).json())
+
+    assert client.post('/analytics/funnel/refresh').status_code == 200
+    return applications, responses, postings, response_types
+
+
+def naive_funnel(applications, responses, postings, response_types):
+    by_application = defaultdict(list)
+    for response in responses:
+        by_application[response['application_id']].append(response)
+
+    outcomes = []
+    for application in applications:
+        received = by_application[application['id']]
+        first = min((date.fromisoformat(r['date_received']) for r in received), default=None)
+        posting = postings[application['posting_id']]
+        outcomes.append({
+            'id': application['id'],
+            'overall': 'all',
+            'platform': posting['platform'],
+            'company': posting['company'],
+            'resume': str(application['resume_id']),
+            'days': (first - date.fromisoformat(application['date_submitted'])).days if first else None,
+            'interviewed': any(response_types[r['response_type_id']] == 'interview' for r in received),
+        })
+
+    funnel = {}
+    for dimension in DIMENSIONS:
+        groups = defaultdict(list)
+        for outcome in outcomes:
+            groups[outcome[dimension]].append(outcome)
+        for key, group in groups.items():
+            days = [outcome['days'] for outcome in group if outcome['days'] is not None]
+            interviewed = sum(outcome['interviewed'] for outcome in group)
+            funnel[dimension, key] = {
+                'dimension': dimension,
+                'key': key,
+                'applications': len(group),
+                'responded': len(days),
+                'interviewed': interviewed,
+                'response_rate': pytest.approx(len(days) / len(group)),
+                'interview_rate': pytest.approx(interviewed / len(group)),
+                'median_days_to_response': pytest.approx(statistics.median(days)) if days else None,
+            }
+
+    interviewed_ids = {outcome['id'] for outcome in outcomes if outcome['interviewed']}
+    by_type = {}
+    for type_id, name in response_types.items():
+        ids = {r['application_id'] for r in responses if r['response_type_id'] == type_id}
+        interviewed = len(ids & interviewed_ids)
+        by_type[type_id] = {
+            'response_type_id': type_id,
+            'response_type': name,
+            'applications': len(ids),
+            'interviewed': interviewed,
+            'interview_rate': pytest.approx(interviewed / len(ids) if ids else 0),
+        }
+    return funnel, by_type
+
+
+@pytest.mark.parametrize('dimension', DIMENSIONS)
+def test_funnel_matches_recompute(client, seeded, dimension):
+    expected, _ = naive_funnel(*seeded)
+    rows = client.get(f'/analytics/funnel/{dimension}').json()
+    assert {row['key']: row for row in rows} == {key: row for (dim, key), row in expected.items() if dim == dimension}
+
+def test_overall_funnel_matches_recompute(client, seeded):
+    expected, _ = naive_funnel(*seeded)
+    assert client.get('/analytics/funnel').json() == expected['overall', 'all']
+
+def test_response_type_conversion_matches_recompute(client, seeded):
+    _, expected = naive_funnel(*seeded)
+    rows = client.get('/analytics/funnel/response_types').json()
+    assert {row['response_type_id']: row for row in rows} == expected
+
+def test_funnel_follows_writes(client, seeded):
+    applications, responses, postings, response_types = seeded
+    interview = next(type_id for type_id, name in response_types.items() if name == 'interview')
+    silent = next(a for a in applications if all(r['application_id'] != a['id'] for r in responses))
+    responses = responses + [client.post('/responses/', json={
+        'application_id': silent['id'],
+        'response_type_id': interview,
+        'date_received': silent['date_submitted'],
+    }).json()]
+
+    # Writes refresh the views in the background; the test client runs background tasks before returning
+    expected, _ = naive_funnel(applications, responses, postings, response_types)
+    assert client.get('/analytics/funnel').json() == expected['overall', 'all']
@@ -0,0 +1,61 @@
+# app/tests/test_changes.py
+#
+# The delta sync of `GET /{endpoint}/changes` (see conftest.py for the database)
+from sqlalchemy import text
+
+
+def posting(client, title: str) -> dict:
+    return client.post('/postings/', json={
+        'platform': 'linkedin', 'company': 'Acme', 'title': title, 'responsibilities': 'r', 'qualifications': 'q',
+    }).json()
+
+def changes(client, since: int = 0):
+    delta = client.get('/postings/changes', params={'since': since}).json()
+    return delta['version'], {row['id']: row for row in delta['upserted']}, delta['deleted']
+
+
+def test_upserts_deletes_and_cursor(client):
+    first, second = posting(client, 'First'), posting(client, 'Second')
+    cursor, upserted, deleted = changes(client)
+    assert set(upserted) == {first['id'], second['id']} and deleted == []
+
+    # Nothing changed since the cursor
+    assert changes(client, cursor)[1:] == ({}, [])
+
+    client.put(f"/postings/{first['id']}", json={**first, 'title': 'First, renamed'})
+    client.delete(f"/postings/{second['id']}")
+    cursor, upserted, deleted = changes(client, cursor)
+    assert list(upserted) == [first['id']] and upserted[first['id']]['title'] == 'First, renamed'
+    assert deleted == [second['id']]
+    assert changes(client, cursor)[1:] == ({}, [])
+
+def test_tombstone(client):
+    from src.database import SessionLocal
+
+    deleted = posting(client, 'Deleted')
+    client.delete(f"/postings/{deleted['id']}")
+    with SessionLocal() as db:
+        tombstone = db.execute(
+            text("SELECT version FROM tombstone WHERE table_name = 'posting' AND row_id = :id"), {'id': deleted['id']}
+        ).one()
+    # A full sync from scratch still learns about the delete
+    assert deleted['id'] in changes(client)[2]
+    assert deleted['id'] in changes(client, tombstone.version)[2]
+
+def test_late_commit_is_not_skipped(client):
+    from src.database import SessionLocal
+
+    cursor = changes(client)[0]
+    # A transaction that writes first but commits after a later one, without blocking it
+    with SessionLocal() as slow:
+        slow.execute(text(
+            "INSERT INTO posting (platform, company, title, responsibilities, qualifications) "
+            "VALUES ('linkedin', 'Acme', 'Slow', 'r', 'q')"
+        ))
+        fast = posting(client, 'Fast')
+        cursor, upserted, _ = changes(client, cursor)
+        assert fast['id'] in upserted
+        slow.commit()
+
+    titles = [row['title'] for row in changes(client, cursor)[1].values()]
+    assert 'Slow' in titles
@@ -0,0 +1,43 @@
+# app/tests/test_ingest.py
+#
+# Mailbox imports into a live database (see conftest.py for the database)
+from src.ingest import MailboxIngestion
+
+
+def mbox_message(message_id: str, date: str | None) -> str:
+    date_header = f'Date: {date}\n' if date else ''
+    return (
+        f'From recruiter@initech.com Mon Feb  3 10:00:00 2025\n'
+        f'From: Initech Recruiting <recruiter@initech.com>\n'
+        f'Message-ID: <{message_id}@initech.com>\n{date_header}'
+        f'Subject: Your Engineer application\n\n'
+        f'We would like to schedule a phone screen.\n\n'
+    )
+
+def ingest(tmp_path, *messages: str):
+    mailbox = tmp_path / 'inbox.mbox'
+    mailbox.write_text(''.join(messages))
+    return MailboxIngestion(str(mailbox), str(tmp_path / 'checkpoint'), workers=1).run()
+
+
+def test_responses_in_archived_years_are_skipped(client, application, tmp_path):
+    client.post('/responses/', json={'application_id': application['id'], 'response_type_id': 1, 'date_received': '2019-01-20'})
+    assert client.post('/partitions/archive/responses/2019').status_code == 200
+
+    stats = ingest(
+        tmp_path,
+        mbox_message('archived', 'Fri, 01 Feb 2019 10:00:00 +0000'),
+        mbox_message('live', 'Mon, 03 Feb 2025 10:00:00 +0000'),
+    )
+    assert (stats.new, stats.matched, stats.archived) == (2, 1, 1)
+    assert [row['date_received'] for row in client.get('/responses/').json()] == ['2025-02-03']
+
+def test_undated_match_can_be_claimed_later(client, application, tmp_path):
+    stats = ingest(tmp_path, mbox_message('undated', None))
+    assert (stats.new, stats.matched) == (1, 0)
+
+    # The same message, now dated (e.g. re-exported), still gets its response
+    (tmp_path / 'checkpoint').unlink()
+    stats = ingest(tmp_path, mbox_message('undated', 'Tue, 04 Feb 2025 10:00:00 +0000'))
+    assert (stats.new, stats.matched) == (1, 1)
+    assert '2025-02-04' in [row['date_received'] for row in client.get('/responses/').json()]
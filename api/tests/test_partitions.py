@@ -0,0 +1,59 @@
+# app/tests/test_partitions.py
+#
+# Moving rows between yearly partitions and archiving them (see conftest.py for the database)
+from datetime import date
+
+
+def changes(client, endpoint: str, since: int):
+    delta = client.get(f'/{endpoint}/changes', params={'since': since}).json()
+    return [row['id'] for row in delta['upserted']], delta['deleted']
+
+def test_move_application_without_responses(client, application):
+    since = client.get('/applications/changes').json()['version']
+    moved = client.put(f"/applications/{application['id']}", json={**application, 'date_submitted': '2026-01-02'})
+    assert moved.status_code == 200 and moved.json()['date_submitted'] == '2026-01-02'
+    assert changes(client, 'applications', since) == ([application['id']], [])
+
+def test_move_referenced_application(client, application):
+    response = client.post('/responses/', json={
+        'application_id': application['id'], 'response_type_id': 1, 'date_received': '2026-01-05',
+    }).json()
+    since = client.get('/applications/changes').json()['version']
+    moved = client.put(f"/applications/{application['id']}", json={**application, 'date_submitted': '2025-12-20'})
+    assert moved.status_code == 200
+    assert changes(client, 'applications', since) == ([application['id']], [])
+
+    since = client.get('/responses/changes').json()['version']
+    moved = client.put(f"/responses/{response['id']}", json={**response, 'date_received': '2025-12-28'})
+    assert moved.status_code == 200
+    assert changes(client, 'responses', since) == ([response['id']], [])
+
+def test_delete_referenced_application(client, application):
+    deleted = client.delete(f"/applications/{application['id']}")
+    assert deleted.status_code == 409 and 'still referenced' in deleted.json()['detail']
+    assert client.get(f"/applications/{application['id']}").status_code == 200
+
+def test_write_to_archived_year(client, application):
+    old = client.post('/applications/', json={**application, 'date_submitted': '2020-05-01'})
+    assert old.status_code == 200
+    assert client.post('/partitions/archive/applications/2020').status_code == 200
+
+    created = client.post('/applications/', json={**application, 'date_submitted': '2020-06-01'})
+    assert created.status_code == 409 and 'archived' in created.json()['detail']
+    moved = client.put(f"/applications/{application['id']}", json={**application, 'date_submitted': '2020-06-01'})
+    assert moved.status_code == 409
+
+def test_archive_current_year(client):
+    archived = client.post(f'/partitions/archive/applications/{date.today().year}')
+    assert archived.status_code == 422
+
+def test_archive_referenced_applications(client, application):
+    old = client.post('/applications/', json={**application, 'date_submitted': '2021-05-01'}).json()
+    client.post('/responses/', json={'application_id': old['id'], 'response_type_id': 1, 'date_received': '2022-01-10'})
+    archived = client.post('/partitions/archive/applications/2021')
+    assert archived.status_code == 409 and 'live responses' in archived.json()['detail']
+    assert client.get(f"/applications/{old['id']}").status_code == 200
+
+    # Once its responses are archived, the year can go too
+    assert client.post('/partitions/archive/responses/2022').status_code == 200
+    assert client.post('/partitions/archive/applications/2021').status_code == 200
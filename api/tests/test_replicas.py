@@ -0,0 +1,81 @@
+# app/tests/test_replicas.py
+#
+# Read routing between the primary and its replicas, with a SQLite file standing in for each
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import ReplicaPool
+from src.dependancies import READ_PRIMARY_COOKIE
+import src.dependancies as dependancies
+import src.models as model
+import main
+
+
+def database(path, *previews: str) -> str:
+    """A SQLite database at `path` holding resumes with the given previews; returns its URL."""
+    path.parent.mkdir(exist_ok=True)
+    url = f'sqlite:///{path}'
+    engine = create_engine(url)
+    model.Base.metadata.create_all(engine, tables=[model.ResumeBlob.__table__, model.Resume.__table__])
+    with engine.begin() as connection:
+        for preview in previews:
+            connection.execute(model.Resume.__table__.insert().values(digest='', size=0, preview=preview))
+    engine.dispose()
+    return url
+
+def previews(response) -> list[str]:
+    assert response.status_code == 200
+    return [row['preview'] for row in response.json()]
+
+@pytest.fixture(autouse=True)
+def no_health_thread(monkeypatch):
+    # Probes run when a test calls `check()`, not on a background thread racing the test
+    monkeypatch.setattr(ReplicaPool, '_monitor', lambda self: None)
+
+@pytest.fixture
+def routing(tmp_path, monkeypatch):
+    primary = create_engine(database(tmp_path / 'primary.db', 'on primary'))
+    replicas = ReplicaPool([database(tmp_path / 'replica' / 'replica.db', 'on replica')], health_interval=3600)
+    monkeypatch.setattr(dependancies, 'SessionLocal', sessionmaker(autocommit=False, autoflush=False, bind=primary))
+    monkeypatch.setattr(dependancies, 'replicas', replicas)
+    monkeypatch.setattr(main, 'replicas', replicas)
+    return replicas, tmp_path / 'replica'
+
+
+def test_writes_go_to_the_primary_and_reads_to_the_replica(routing):
+    client = TestClient(main.app)
+    written = client.post('/resumes/', json={'data': 'written'})
+    assert written.status_code == 200 and READ_PRIMARY_COOKIE in written.cookies
+
+    assert previews(TestClient(main.app).get('/resumes/')) == ['on replica']
+
+def test_cookie_pins_reads_to_the_primary(routing):
+    client = TestClient(main.app)
+    client.post('/resumes/', json={'data': 'written'})
+    assert previews(client.get('/resumes/')) == ['on primary', 'written']
+
+def test_unhealthy_replica_falls_back_to_the_primary(routing):
+    replicas, replica_dir = routing
+    replicas.engines[0].dispose()
+    replica_dir.rename(replica_dir.with_name('offline'))
+    client = TestClient(main.app)
+
+    # The failing query marks the replica unhealthy; later reads use the primary
+    assert client.get('/resumes/').status_code == 503
+    assert previews(client.get('/resumes/')) == ['on primary']
+
+    # A successful health probe brings it back
+    replica_dir.with_name('offline').rename(replica_dir)
+    replicas.check()
+    assert previews(client.get('/resumes/')) == ['on replica']
+
+def test_round_robin(tmp_path):
+    replicas = ReplicaPool([database(tmp_path / f'{i}.db') for i in range(2)], health_interval=3600)
+    first, second, third = (replicas.acquire() for _ in range(3))
+    assert first is not second and first is third
+
+    replicas.mark_unhealthy(second)
+    assert replicas.acquire() is first and replicas.acquire() is first
+    replicas.mark_unhealthy(first)
+    assert replicas.acquire() is None
@@ -0,0 +1,29 @@
+# app/tests/test_resumes.py
+import pytest
+from src.resumes import RangeNotSatisfiable, parse_range
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-4', (0, 4)),
+    ('bytes=5-', (5, 9)),
+    ('bytes=3-100', (3, 9)),
+    ('bytes=-4', (6, 9)),
+    ('bytes=-100', (0, 9)),
+    # Invalid headers are ignored and the full content is served
+    ('bytes=3-1', None),
+    ('bytes=-', None),
+    ('items=0-4', None),
+    ('bytes=0-1,4-5', None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 10) == expected
+
+@pytest.mark.parametrize('header, size', [
+    ('bytes=10-', 10),
+    ('bytes=10-20', 10),
+    ('bytes=-0', 10),
+    ('bytes=-5', 0),
+])
+def test_unsatisfiable_range(header, size):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, size)
@@ -2,9 +2,73 @@ CREATE DATABASE apptracker;
 
 \c apptracker;
 
+-- Row versions: a written or deleted row is stamped with the id of the writing transaction.
+-- Ids are drawn at first write, not commit, so readers page by commit visibility instead: every
+-- transaction below a snapshot's xmin has finished, and that xmin is the cursor of the next sync
+-- (see CRUDBase.changes). No lock orders the writers.
+CREATE FUNCTION row_version() RETURNS BIGINT AS $$
+    SELECT pg_current_xact_id()::TEXT::BIGINT;
+$$ LANGUAGE sql;
+
+CREATE TABLE tombstone (
+    table_name TEXT NOT NULL,
+    row_id INT NOT NULL,
+    version BIGINT NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (table_name, row_id)
+);
+
+CREATE FUNCTION bump_row_version() RETURNS trigger AS $$
+BEGIN
+    NEW.version := row_version();
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Takes the table name as an argument: on partitioned tables TG_TABLE_NAME is the partition.
+-- An update moving a row to another partition runs as a delete and an insert, so a row that
+-- still exists once the statement is done was moved, not deleted.
+CREATE FUNCTION record_tombstone() RETURNS trigger AS $$
+DECLARE
+    moved BOOLEAN;
+BEGIN
+    EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE id = $1)', TG_ARGV[0]) INTO moved USING OLD.id;
+    IF moved THEN
+        RETURN OLD;
+    END IF;
+    INSERT INTO tombstone (table_name, row_id, version)
+    VALUES (TG_ARGV[0], OLD.id, row_version())
+    ON CONFLICT (table_name, row_id) DO UPDATE SET version = EXCLUDED.version, deleted_at = now();
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- A row inserted with the id of a tombstoned one supersedes the tombstone
+CREATE FUNCTION clear_tombstone() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM tombstone WHERE table_name = TG_ARGV[0] AND row_id = NEW.id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Resume content is content-addressed by sha256 and stored zlib-compressed, so identical
+-- uploads share one row. It is already compressed, so TOAST should store it out of line as-is.
+CREATE TABLE resume_blob (
+    digest TEXT PRIMARY KEY,
+    size INT NOT NULL,
+    compressed_size INT NOT NULL,
+    content BYTEA NOT NULL
+);
+ALTER TABLE resume_blob ALTER COLUMN content SET STORAGE EXTERNAL;
+
 CREATE TABLE resume (
     id SERIAL PRIMARY KEY,
-    data JSONB NOT NULL
+    digest TEXT NOT NULL REFERENCES resume_blob(digest),
+    size INT NOT NULL,
+    preview TEXT NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
 CREATE TABLE posting (
@@ -16,29 +80,204 @@ CREATE TABLE posting (
     description TEXT,
     responsibilities VARCHAR NOT NULL,
     qualifications VARCHAR NOT NULL,
-    remote BOOLEAN
+    remote BOOLEAN,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
+-- Applications and responses only grow, so they are range partitioned by year on their date
+-- (see ensure_partition below). Primary keys must include the partition key; ids are still
+-- unique since they come from one sequence per table.
 CREATE TABLE application (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     posting_id INT NOT NULL REFERENCES posting(id),
     resume_id INT NOT NULL REFERENCES resume(id),
-    date_submitted DATE NOT NULL
-);
+    date_submitted DATE NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, date_submitted)
+) PARTITION BY RANGE (date_submitted);
 
 CREATE TABLE response_type (
     id SERIAL PRIMARY KEY,
-    name VARCHAR NOT NULL
+    name VARCHAR NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
+-- application(id) alone is not unique to Postgres, so response.application_id is checked by triggers
 CREATE TABLE response (
-    id SERIAL PRIMARY KEY,
-    application_id INT NOT NULL REFERENCES application(id),
+    id SERIAL,
+    application_id INT NOT NULL,
     response_type_id INT NOT NULL REFERENCES response_type(id),
     date_received DATE NOT NULL,
-    data TEXT
+    data TEXT,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, date_received)
+) PARTITION BY RANGE (date_received);
+
+-- Locks the application like a foreign key would, so a concurrent delete waits for this transaction
+CREATE FUNCTION check_response_application() RETURNS trigger AS $$
+BEGIN
+    PERFORM 1 FROM application WHERE id = NEW.application_id FOR KEY SHARE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'application % does not exist', NEW.application_id USING ERRCODE = 'foreign_key_violation';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Runs after the delete, so an application moved to another year's partition still exists
+CREATE FUNCTION check_application_unreferenced() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM application WHERE id = OLD.id) THEN
+        RETURN OLD;
+    END IF;
+    IF EXISTS (SELECT 1 FROM response WHERE application_id = OLD.id) THEN
+        RAISE EXCEPTION 'application % is still referenced by responses', OLD.id USING ERRCODE = 'foreign_key_violation';
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER response_application_fk BEFORE INSERT OR UPDATE OF application_id ON response
+    FOR EACH ROW EXECUTE FUNCTION check_response_application();
+CREATE TRIGGER application_response_fk AFTER DELETE ON application
+    FOR EACH ROW EXECUTE FUNCTION check_application_unreferenced();
+
+-- Every message seen by the mailbox import (src/ingest.py), matched or not, keyed on its
+-- Message-ID so re-imports and resumed imports never create a response twice
+CREATE TABLE ingested_message (
+    message_id TEXT PRIMARY KEY,
+    mailbox TEXT NOT NULL,
+    application_id INT,
+    response_type_id INT REFERENCES response_type(id),
+    date_received DATE,
+    ingested_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Old partitions are detached into this schema. They drop out of live reads, index scans and
+-- vacuums but stay queryable; `tablespace` can point them at cheaper (e.g. compressed) storage.
+CREATE SCHEMA archive;
+
+CREATE TABLE archived_partition (
+    table_name TEXT NOT NULL,
+    partition_name TEXT NOT NULL,
+    range_start DATE NOT NULL,
+    range_end DATE NOT NULL,
+    row_count BIGINT NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (table_name, range_start)
 );
 
+-- Creates the yearly partition of `parent_table` that holds `day`, unless it exists
+CREATE FUNCTION ensure_partition(parent_table TEXT, day DATE) RETURNS TEXT AS $$
+DECLARE
+    start_date DATE := date_trunc('year', day)::DATE;
+    partition_name TEXT := format('%s_%s', parent_table, extract(year FROM day));
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext(partition_name));
+    IF EXISTS (SELECT 1 FROM archived_partition a WHERE a.table_name = parent_table AND a.range_start = start_date) THEN
+        RAISE EXCEPTION 'partition % is archived', partition_name USING ERRCODE = 'check_violation';
+    END IF;
+    IF to_regclass(format('public.%I', partition_name)) IS NULL THEN
+        EXECUTE format('CREATE TABLE public.%I PARTITION OF public.%I FOR VALUES FROM (%L) TO (%L)',
+                       partition_name, parent_table, start_date, (start_date + INTERVAL '1 year')::DATE);
+    END IF;
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Keeps partitions up to `years_ahead` years from now in place; run periodically by the API
+CREATE FUNCTION ensure_future_partitions(years_ahead INT DEFAULT 1) RETURNS void AS $$
+DECLARE
+    parent_table TEXT;
+BEGIN
+    FOREACH parent_table IN ARRAY ARRAY['application', 'response'] LOOP
+        FOR offset_years IN 0..years_ahead LOOP
+            PERFORM ensure_partition(parent_table, (current_date + make_interval(years => offset_years))::DATE);
+        END LOOP;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detaches a yearly partition into the archive schema. Its rows are tombstoned so that
+-- delta-synced clients drop them like deleted rows; returns the number of archived rows.
+-- Only past years can be archived, and an application year only once none of its
+-- applications has live responses left (archive those responses' years first).
+CREATE FUNCTION archive_partition(parent_table TEXT, partition_year INT, tablespace TEXT DEFAULT NULL) RETURNS BIGINT AS $$
+DECLARE
+    start_date DATE := make_date(partition_year, 1, 1);
+    partition_name TEXT := format('%s_%s', parent_table, partition_year);
+    referenced INT;
+    archived BIGINT;
+BEGIN
+    IF partition_year >= extract(year FROM current_date) THEN
+        RAISE EXCEPTION 'only past years can be archived, not %', partition_year USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+    IF to_regclass(format('public.%I', partition_name)) IS NULL THEN
+        RAISE EXCEPTION 'partition % does not exist', partition_name USING ERRCODE = 'undefined_table';
+    END IF;
+
+    -- check_response_application only takes FOR KEY SHARE, which does not conflict with another
+    -- key share, so the whole partition is locked: responses being inserted commit first, and
+    -- later ones wait and then find their application gone
+    EXECUTE format('LOCK TABLE public.%I IN ACCESS EXCLUSIVE MODE', partition_name);
+    IF parent_table = 'application' THEN
+        EXECUTE format('SELECT r.application_id FROM response r JOIN public.%I a ON a.id = r.application_id LIMIT 1', partition_name)
+            INTO referenced;
+        IF referenced IS NOT NULL THEN
+            RAISE EXCEPTION 'application % is still referenced by live responses', referenced
+                USING ERRCODE = 'foreign_key_violation';
+        END IF;
+    END IF;
+
+    EXECUTE format('ALTER TABLE public.%I DETACH PARTITION public.%I', parent_table, partition_name);
+    EXECUTE format('ALTER TABLE public.%I SET SCHEMA archive', partition_name);
+    IF tablespace IS NOT NULL THEN
+        EXECUTE format('ALTER TABLE archive.%I SET TABLESPACE %I', partition_name, tablespace);
+    END IF;
+
+    EXECUTE format('INSERT INTO tombstone (table_name, row_id, version)
+                    SELECT %L, id, row_version() FROM archive.%I
+                    ON CONFLICT (table_name, row_id) DO UPDATE SET version = EXCLUDED.version, deleted_at = now()',
+                   parent_table, partition_name);
+    GET DIAGNOSTICS archived = ROW_COUNT;
+
+    INSERT INTO archived_partition (table_name, partition_name, range_start, range_end, row_count)
+    VALUES (parent_table, partition_name, start_date, (start_date + INTERVAL '1 year')::DATE, archived);
+    RETURN archived;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE INDEX idx_application_posting_id ON application(posting_id);
+CREATE INDEX idx_resume_digest ON resume(digest);
+-- Prefix searches on the fields the UI labels foreign keys with (`lower(field) LIKE 'prefix%'`)
+CREATE INDEX idx_resume_preview_prefix ON resume(lower(preview) text_pattern_ops);
+CREATE INDEX idx_posting_title_prefix ON posting(lower(title) text_pattern_ops);
+CREATE INDEX idx_application_resume_id ON application(resume_id);
+CREATE INDEX idx_responses_application_id ON response(application_id);
+CREATE INDEX idx_responses_response_type_id ON response(response_type_id);
+
+CREATE INDEX idx_tombstone_version ON tombstone(table_name, version);
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['resume', 'posting', 'application', 'response_type', 'response'] LOOP
+        EXECUTE format('CREATE INDEX idx_%1$s_version ON %1$I(version)', t);
+        EXECUTE format('CREATE TRIGGER %1$s_version BEFORE INSERT OR UPDATE ON %1$I FOR EACH ROW EXECUTE FUNCTION bump_row_version()', t);
+        EXECUTE format('CREATE TRIGGER %1$s_tombstone AFTER DELETE ON %1$I FOR EACH ROW EXECUTE FUNCTION record_tombstone(%1$L)', t);
+        EXECUTE format('CREATE TRIGGER %1$s_untombstone AFTER INSERT ON %1$I FOR EACH ROW EXECUTE FUNCTION clear_tombstone(%1$L)', t);
+    END LOOP;
+END;
+$$;
+
+-- Triggers and indexes on the partitioned tables are cloned onto every partition
+SELECT ensure_future_partitions();
+
 INSERT INTO response_type (name)
 VALUES
     ('email'),
@@ -47,7 +286,53 @@ VALUES
     ('interview'),
     ('takehome');
 
-CREATE INDEX idx_application_posting_id ON application(posting_id);
-CREATE INDEX idx_application_resume_id ON application(resume_id);
-CREATE INDEX idx_responses_application_id ON response(application_id);
-CREATE INDEX idx_responses_response_type_id ON response(response_type_id);
+-- Application funnel. Dashboards read these instead of joining the base tables;
+-- the API refreshes them concurrently (readers are never blocked) after writes.
+CREATE MATERIALIZED VIEW funnel_application AS
+SELECT
+    a.id AS application_id,
+    p.platform,
+    p.company,
+    a.resume_id,
+    a.date_submitted,
+    MIN(r.date_received) AS first_response_date,
+    MIN(r.date_received) - a.date_submitted AS days_to_first_response,
+    COALESCE(bool_or(rt.name = 'interview'), FALSE) AS interviewed
+FROM application a
+JOIN posting p ON p.id = a.posting_id
+LEFT JOIN response r ON r.application_id = a.id
+LEFT JOIN response_type rt ON rt.id = r.response_type_id
+GROUP BY a.id, p.platform, p.company, a.resume_id, a.date_submitted;
+
+CREATE UNIQUE INDEX idx_funnel_application ON funnel_application(application_id);
+
+CREATE MATERIALIZED VIEW funnel_summary AS
+SELECT
+    CASE
+        WHEN GROUPING(platform) = 0 THEN 'platform'
+        WHEN GROUPING(company) = 0 THEN 'company'
+        WHEN GROUPING(resume_id) = 0 THEN 'resume'
+        ELSE 'overall'
+    END AS dimension,
+    COALESCE(platform, company, resume_id::TEXT, 'all') AS key,
+    COUNT(*) AS applications,
+    COUNT(first_response_date) AS responded,
+    COUNT(*) FILTER (WHERE interviewed) AS interviewed,
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY days_to_first_response) AS median_days_to_response
+FROM funnel_application
+GROUP BY GROUPING SETS ((platform), (company), (resume_id), ());
+
+CREATE UNIQUE INDEX idx_funnel_summary ON funnel_summary(dimension, key);
+
+CREATE MATERIALIZED VIEW funnel_by_response_type AS
+SELECT
+    rt.id AS response_type_id,
+    rt.name AS response_type,
+    COUNT(DISTINCT fa.application_id) AS applications,
+    COUNT(DISTINCT fa.application_id) FILTER (WHERE fa.interviewed) AS interviewed
+FROM response_type rt
+LEFT JOIN response r ON r.response_type_id = rt.id
+LEFT JOIN funnel_application fa ON fa.application_id = r.application_id
+GROUP BY rt.id, rt.name;
+
+CREATE UNIQUE INDEX idx_funnel_by_response_type ON funnel_by_response_type(response_type_id);
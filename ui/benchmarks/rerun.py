@@ -0,0 +1,60 @@
+# ./benchmarks/rerun.py
+"""
+Microbenchmark of per-rerun script time.
+
+Runs `main.py` headless through Streamlit's `AppTest` against a running API and
+reports how long a warm rerun (every API read already cached) takes per entity,
+plus the cost of compiling the form layer where the tree has `FormRegistry`.
+Runs unchanged on trees from before the registry, so both sides of a change can
+be measured with the same script.
+
+Warm reruns are dominated by widget rendering and the data table; compiling the
+forms once per process saves well under a millisecond per rerun, which is within
+the run-to-run noise of these numbers.
+
+Usage (from the `ui` directory):
+    API_URL=http://localhost:8000 python -m benchmarks.rerun [reruns]
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+from streamlit.testing.v1 import AppTest
+
+MAIN = Path(__file__).resolve().parent.parent / 'main.py'
+
+
+def bench_compile(repeats=200):
+    try:
+        from src.components.registry import FormRegistry
+    except ImportError:
+        print(f'{"form compile":<16} skipped (no FormRegistry in this tree)')
+        return
+    from main import create_forms
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        FormRegistry(create_forms())
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f'{"form compile":<16} median {statistics.median(timings):7.2f} ms   (once per process)')
+
+
+def bench(reruns=50):
+    at = AppTest.from_file(str(MAIN), default_timeout=30)
+    at.run()
+    for entity in at.sidebar.radio[0].options:
+        # Warm up caches for this entity before timing
+        at.sidebar.radio[0].set_value(entity).run()
+        timings = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            timings.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        print(f'{entity:<16} median {statistics.median(timings):7.2f} ms   p95 {statistics.quantiles(timings, n=20)[-1]:7.2f} ms')
+
+
+if __name__ == '__main__':
+    bench_compile()
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -2,10 +2,12 @@ import streamlit as st
 import logging
 from src.settings import api_url, layout_mode
 from src.schemas import Field, ForeignKeyField, FieldType, FieldTemplate
-from src.components.form import Form, FormTree
+from src.components.form import Form
+from src.components.registry import FormRegistry
 from src.components.table import TableDisplay
 from src.components.crud import DynamicCRUDForm
 from src.api import APIClient
+from src import profiling
 
 logger = logging.getLogger(__name__)
 
@@ -34,11 +36,13 @@ def create_forms():
         name='resume',
         endpoint='resumes',
         id_field='id',
-        label_field='data',
+        label_field='preview',
         allow_children_make_new=True,
         fields_list=[
             FieldTemplate(name='data', type=FieldType.TEXT, is_required=True)
         ],
+        # List reads return a preview of the content rather than the content itself
+        table_columns=['id', 'preview', 'size', 'digest'],
     )
 
     PostingForm = Form(
@@ -100,21 +104,27 @@ def create_forms():
     all_forms = [ResumeForm, PostingForm, ApplicationForm, ResponseTypeForm, ResponseForm]
     return all_forms
 
+# Built once per process; reruns only bind widget values to the compiled forms
+@st.cache_resource
+def compile_forms():
+    return FormRegistry(create_forms())
+
 
 if __name__ == "__main__":
-    # Initialize forms
-    all_forms = create_forms()
+    # No-op unless UI_PROFILING is set
+    profiling.start()
 
-    # Initialize api client, crud_form, table
-    api_client = APIClient(base_url=api_url)
-    crud_form = DynamicCRUDForm(api_client, all_forms)
-    table_display = TableDisplay(api_client=api_client)   
+    with profiling.timed('build_forms'):
+        # Initialize forms
+        registry = compile_forms()
 
-    # Prepare forms for use
-    crud_form.initialize_forms()
+        # Initialize api client, crud_form, table
+        api_client = APIClient(base_url=api_url)
+        crud_form = DynamicCRUDForm(api_client, registry)
+        table_display = TableDisplay(api_client=api_client)
 
     # Maps human readable names to form endpoints
-    form_endpoints = {form.endpoint.title().replace('_', ' '): form.endpoint for form in all_forms}
+    form_endpoints = {form.endpoint.title().replace('_', ' '): form.endpoint for form in registry.forms.values()}
 
     # Sidebar for selecting entity
     with st.sidebar:
@@ -127,8 +137,11 @@ if __name__ == "__main__":
     # Form endpoint currently selected
     endpoint = form_endpoints[selected_entity]
 
-    with st.expander('Data'):
-        table_display.show_table(endpoint)
+    with st.expander('Data'), profiling.timed('table', endpoint=endpoint):
+        form = registry.forms[endpoint]
+        table_display.show_table(endpoint, columns=form.table_columns or ['id'] + [field.name for field in form.fields_list])
 
-    with st.expander('Form', expanded=True):
+    with st.expander('Form', expanded=True), profiling.timed('form', endpoint=endpoint):
         crud_form.run(endpoint)
+
+    profiling.finish()
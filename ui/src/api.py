@@ -1,5 +1,19 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from http.cookiejar import DefaultCookiePolicy
+from src import profiling
+from src.cache import EndpointCache
+from src.replica import TableReplica
+from src.settings import (
+    api_timeout, api_retries, api_backoff, api_pool_size, cache_max_entries, cache_ttl,
+    query_cache_size, fk_search_limit, page_cache_size, table_page_size
+)
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,30 +25,222 @@ class HTTPError(Exception):
 class JSONSerializeError(Exception):
     pass
 
+class _RejectCookies(DefaultCookiePolicy):
+    def set_ok(self, cookie, request):
+        return False
+
+class SessionCookies:
+    """
+    Cookies the API set for one Streamlit session, sent with that session's requests only.
+
+    After a write the API pins the writer's reads to its primary database for a few seconds
+    (`read_primary`); kept in the shared HTTP session, one user's write would pin everyone's reads.
+    """
+    def __init__(self):
+        self._cookies: dict[str, tuple[str, float | None]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, jar):
+        with self._lock:
+            for cookie in jar:
+                self._cookies[cookie.name] = (cookie.value, cookie.expires)
+
+    def current(self) -> dict[str, str]:
+        now = time.time()
+        with self._lock:
+            return {name: value for name, (value, expires) in self._cookies.items() if expires is None or expires > now}
+
+@st.cache_resource
+def get_session():
+    """Process-wide pooled session, so connections are kept alive across reruns."""
+    # Only idempotent methods are retried; a retried POST could create duplicates.
+    # A shed request's Retry-After is the API's queue deadline, so honouring it would stall the
+    # rerun for that long; back off briefly instead and surface the 503 if the API is still busy.
+    retry = Retry(
+        total=api_retries,
+        backoff_factor=api_backoff,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'}),
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(pool_connections=api_pool_size, pool_maxsize=api_pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # Every user shares this session, so its jar keeps no cookies; see `SessionCookies`
+    session.cookies.set_policy(_RejectCookies())
+    return session
+
+def get_session_cookies() -> SessionCookies:
+    """The current Streamlit session's API cookies."""
+    if 'api_cookies' not in st.session_state:
+        st.session_state['api_cookies'] = SessionCookies()
+    return st.session_state['api_cookies']
+
+@st.cache_resource
+def get_cache(name, max_entries=None, ttl=None):
+    """Process-wide read caches, shared by every session like `st.cache_data` was."""
+    return EndpointCache(max_entries=max_entries, ttl=ttl)
+
+@st.cache_resource
+def get_executor():
+    """Process-wide pool for background reads such as next-page prefetches."""
+    return ThreadPoolExecutor(max_workers=api_pool_size, thread_name_prefix='api-prefetch')
+
+@st.cache_resource
+def get_replicas():
+    """Process-wide local copies of tables, keyed by endpoint."""
+    return {}
+
+def _log_prefetch_failure(future):
+    if future.exception():
+        logger.warning(f'prefetch failed: {future.exception()}')
+
 class APIClient:
-    def __init__(self, base_url):
+    def __init__(self, base_url, timeout=api_timeout):
         self.base_url = base_url
+        self.timeout = timeout
+        self.session = get_session()
+        # Resolved here, on the script thread; prefetch and fan-out threads cannot read session state
+        self.cookies = get_session_cookies()
+        # Parameterised reads (searches, pages) get their own LRUs so they cannot crowd out whole-table reads
+        self.cache = get_cache('reads', cache_max_entries, cache_ttl)
+        self.query_cache = get_cache('queries', query_cache_size, cache_ttl)
+        self.page_cache = get_cache('pages', page_cache_size, cache_ttl)
+        self.caches = (self.cache, self.query_cache, self.page_cache)
 
-    @st.cache_data
-    def fetch_data(_self, endpoint):
-        logger.info(f'fetching: {_self.base_url}/{endpoint}')
-        response = requests.get(f"{_self.base_url}/{endpoint}")
-        return response.json()
+    def _url(self, endpoint, id=None):
+        return f"{self.base_url}/{endpoint}" if not id else f"{self.base_url}/{endpoint}/{id}"
 
-    @st.cache_data
-    def perform_crud(_self, endpoint, method, data=None, id=None):
-        url = f"{_self.base_url}/{endpoint}" if not id else f"{_self.base_url}/{endpoint}/{id}"
-
-        try:
-            response = requests.request(method, url, json=data)
-        except TypeError as e:
-            raise JSONSerializeError(e)
+    def _send(self, method, url, data=None, params=None):
+        with profiling.timed('api', method=method, url=url, params=params, cache_hit=False) as timing:
+            try:
+                response = self.session.request(
+                    method, url, json=data, params=params, cookies=self.cookies.current(), timeout=self.timeout
+                )
+            except TypeError as e:
+                raise JSONSerializeError(e)
+            except requests.RequestException as e:
+                raise HTTPError(f'{method} {url} failed: {e}') from e
+            timing.update(status=response.status_code, bytes=len(response.content))
+        self.cookies.update(response.cookies)
 
         if not 200 <= response.status_code <= 299:
             raise HTTPError(f'{response.content}')
 
-        return response.json()
+        return response
+
+    def _request(self, method, url, data=None, params=None):
+        return self._send(method, url, data=data, params=params).json()
+
+    @staticmethod
+    def _cache_key(endpoint, id=None, params=None):
+        key = (endpoint,) if not id else (endpoint, id)
+        return key + (tuple(sorted(params.items())),) if params else key
+
+    # Only safe reads are cached; writes always reach the API.
+    def fetch_data(self, endpoint, id=None, params=None):
+        """GET an endpoint, a record (or sub-resource such as `search`) by `id`, with optional query params."""
+        cache = self.query_cache if params else self.cache
+        data = cache.get(self._cache_key(endpoint, id, params))
+        if data is None:
+            data = self._fetch_into_cache(endpoint, id, params)
+        else:
+            profiling.record('api', method='GET', url=self._url(endpoint, id), params=params, cache_hit=True)
+        return data
+
+    def _fetch_into_cache(self, endpoint, id=None, params=None):
+        url = self._url(endpoint, id)
+        logger.info(f'fetching: {url} {params or ""}')
+        data = self._request('GET', url, params=params)
+        cache = self.query_cache if params else self.cache
+        cache.set(self._cache_key(endpoint, id, params), data)
+        return data
+
+    def search(self, endpoint, field, prefix='', limit=fk_search_limit):
+        """Prefix search on one field of an endpoint, returning at most `limit` rows."""
+        return self.fetch_data(endpoint, 'search', params={'field': field, 'prefix': prefix, 'limit': limit})
+
+    def fetch_many(self, reads):
+        """
+        Fetch several independent reads concurrently; returns {endpoint: data}.
+
+        Each read is either an endpoint or an `(endpoint, id, params)` tuple as taken by `fetch_data`.
+        """
+        reads = {read[0]: read for read in ((r, None, None) if isinstance(r, str) else r for r in reads)}
+        results = {}
+        missing = []
+        for endpoint, (_, id, params) in reads.items():
+            cache = self.query_cache if params else self.cache
+            data = cache.get(self._cache_key(endpoint, id, params))
+            if data is None:
+                missing.append(reads[endpoint])
+            else:
+                profiling.record('api', method='GET', url=self._url(endpoint, id), params=params, cache_hit=True)
+                results[endpoint] = data
+
+        if len(missing) == 1:
+            results[missing[0][0]] = self._fetch_into_cache(*missing[0])
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(len(missing), api_pool_size)) as executor:
+                # A copied context per read lets the workers report to this rerun's profiler
+                futures = [executor.submit(copy_context().run, self._fetch_into_cache, *read) for read in missing]
+                results.update((read[0], future.result()) for read, future in zip(missing, futures))
+
+        return results
+
+    @staticmethod
+    def _page_params(offset, limit, sort=None, descending=False, filter_field=None, filter_value=None):
+        params = {'offset': offset, 'limit': limit, 'sort': sort, 'descending': descending,
+                  'filter_field': filter_field, 'filter_value': filter_value}
+        return {key: value for key, value in params.items() if value not in (None, '')}
+
+    def fetch_page(self, endpoint, offset=0, limit=table_page_size, **query):
+        """
+        GET one sorted/filtered page of an endpoint; returns {'rows': [...], 'total': int}.
+
+        `query` takes the API's `sort`, `descending`, `filter_field` and `filter_value` params.
+        """
+        params = self._page_params(offset, limit, **query)
+        key = self._cache_key(endpoint, 'page', params)
+        page = self.page_cache.get(key)
+        if page is None:
+            url = self._url(endpoint)
+            logger.info(f'fetching page: {url} {params}')
+            response = self._send('GET', url, params=params)
+            page = {'rows': response.json(), 'total': int(response.headers.get('X-Total-Count', 0))}
+            self.page_cache.set(key, page)
+        else:
+            profiling.record('api', method='GET', url=self._url(endpoint), params=params, cache_hit=True)
+        return page
+
+    def prefetch_page(self, endpoint, offset=0, limit=table_page_size, **query):
+        """Fetch a page in the background so that paging forward is served from the cache."""
+        key = self._cache_key(endpoint, 'page', self._page_params(offset, limit, **query))
+        if self.page_cache.get(key) is None:
+            future = get_executor().submit(self.fetch_page, endpoint, offset, limit, **query)
+            future.add_done_callback(_log_prefetch_failure)
+
+    def sync_table(self, endpoint) -> TableReplica:
+        """Bring the local copy of an endpoint up to date by applying only what changed since its last sync."""
+        replica = get_replicas().setdefault(endpoint, TableReplica(endpoint))
+        changes = self._request('GET', self._url(endpoint, 'changes'), params={'since': replica.version})
+        replica.apply(changes)
+        return replica
+
+    def perform_crud(self, endpoint, method, data=None, id=None):
+        if method.upper() == 'GET':
+            return self.fetch_data(endpoint, id=id)
+        response = self._request(method, self._url(endpoint, id), data=data)
+        self.invalidate(endpoint)
+        return response
+
+    def invalidate(self, endpoints):
+        """Evict cached reads of the given endpoints, including the foreign-key label searches on them."""
+        for cache in self.caches:
+            cache.invalidate(endpoints)
 
     def clear_cache(self):
-        self.fetch_data.clear()
-        self.perform_crud.clear()
\ No newline at end of file
+        for cache in self.caches:
+            cache.clear()
@@ -0,0 +1,84 @@
+# ./src/cache.py
+from collections import OrderedDict
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class EndpointCache:
+    """
+    Thread-safe cache of API reads, keyed per endpoint.
+
+    Keys are tuples whose first element is the endpoint the data came from, e.g.
+    `('postings',)` or `('postings', 3)`. Writes evict by endpoint rather than
+    clearing everything. Only the written endpoint goes: views of other endpoints
+    show foreign keys as ids, and their labels are searches keyed under the parent.
+
+    Attributes:
+        max_entries (int | None): Least recently used entries are evicted past this size.
+        ttl (float | None): Seconds an entry stays valid for.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that were not cached or had expired.
+    """
+    def __init__(self, max_entries: int | None = None, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: tuple, default=None):
+        """Return the cached value for `key`, or `default` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = _MISSING
+
+            if entry is _MISSING:
+                self.misses += 1
+                logger.debug(f'cache miss: {key}')
+                return default
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            logger.debug(f'cache hit: {key}')
+            return entry[1]
+
+    def set(self, key: tuple, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def invalidate(self, endpoints):
+        """Evict the entries of the given endpoints."""
+        if isinstance(endpoints, str):
+            endpoints = [endpoints]
+
+        with self._lock:
+            stale = [key for key in self._entries if key[0] in endpoints]
+            for key in stale:
+                del self._entries[key]
+
+        logger.info(f'invalidated {len(stale)} cache entries for {sorted(endpoints)}')
+        self.log_stats()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def log_stats(self):
+        logger.info(f'cache stats: {len(self._entries)} entries, {self.hits} hits, {self.misses} misses, hit rate {self.hit_rate:.1%}')
@@ -7,22 +7,18 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class Form(FormTree):
-    def __init__(self, name, endpoint, fields_list, id_field, label_field, allow_children_make_new):
+class Form:
+    # Form definitions are compiled once and shared by all sessions; per-rerun state lives in `FormTree`.
+    def __init__(self, name, endpoint, fields_list, id_field, label_field, allow_children_make_new, table_columns=None):
         self.name = name
         self.endpoint = endpoint
         self.fields_list = fields_list
         self.id_field = id_field
         self.label_field = label_field
         self.allow_children_make_new = allow_children_make_new
+        # Columns shown in the table when they differ from the form's fields
+        self.table_columns = table_columns
 
-    def init_tree(self, api_client, all_forms):
-        # Passes all forms so FormTree can lookup child fields during FK propagation
-        super().__init__(api_client, self.fields_list, forms=all_forms)
-        return self
-
-def init_form_tree(api_client: APIClient, endpoint: str, all_forms: dict[str, type[Form]]):
-    form_class = all_forms.get(endpoint)
-    if not form_class:
-        raise ValueError(f"No form class found for endpoint: {endpoint}")
-    return form_class.init_tree(api_client=api_client, all_forms=all_forms)
+def init_form_tree(api_client: APIClient, endpoint: str, registry):
+    # Passes all forms so FormTree can lookup child fields during FK propagation
+    return FormTree(api_client, registry.get(endpoint), forms=registry.forms)
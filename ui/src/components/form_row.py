@@ -2,6 +2,8 @@
 import streamlit as st
 from src.schemas import Field, FieldType
 from src.api import APIClient
+from src.options import OptionStore
+from src import profiling
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,27 +39,28 @@ class FormRow:
     Attributes:
         field (Field): The field object representing the form field.
         api_client (APIClient): The API client used to retrieve data for foreign-key fields.
+        option_store (OptionStore): Session-wide store of options for foreign-key selectboxes.
         is_new (bool): Indicates whether the "New" checkbox is selected for a foreign-key field.
-        dropdown_options (dict): Stores options for foreign-key selectboxes.
         pending_id_from (str): Tracks the parent endpoint if the field is awaiting a foreign key ID.
     """
-    def __init__(self, field: Field, api_client: APIClient, parent=None):
+    def __init__(self, field: Field, api_client: APIClient, option_store: OptionStore, parent=None):
         self.field = field
         self.api_client = api_client
+        self.option_store = option_store
         self.is_new = False
-        self.dropdown_options = {}
         self.pending_id_from = None  # Track if this field is pending a foreign key
 
     def render(self, fk_tracker: dict = None, allow_new: bool = True):
         """Render the form row with two columns."""
         fk_tracker = fk_tracker or {}
-        _, left_col, right_col = st.columns([.2, 4, 8], vertical_alignment='bottom')
+        with profiling.timed('row', field=f'{self.field.form_endpoint}.{self.field.name}'):
+            _, left_col, right_col = st.columns([.2, 4, 8], vertical_alignment='bottom')
 
-        with left_col:
-            self._render_left_column(fk_tracker, allow_new=allow_new)
+            with left_col:
+                self._render_left_column(fk_tracker, allow_new=allow_new)
 
-        with right_col:
-            return self._render_right_column()
+            with right_col:
+                return self._render_right_column()
 
     def _render_left_column(self, fk_tracker, allow_new):
         """Render the left column, handling the 'New' checkbox or displaying the field's name."""
@@ -103,24 +106,20 @@ class FormRow:
             return get_field_input_component(self.field)
 
     def _create_foreign_key_selectbox(self):
-        """Create a selectbox; click behavior propogates additional fields."""
-        if self.field.name not in self.dropdown_options:
-            self._fetch_foreign_key_options()
-
-        options = self.dropdown_options.get(self.field.name, {})
-        labels = list(options.values())
-        selected_label = st.selectbox(create_title(self.field), options=labels, label_visibility='visible', key=f'{self.field.name}')
-        selected_id = self._get_selected_foreign_key_id(options, selected_label)
-        return selected_id
-
-    def _fetch_foreign_key_options(self):
-        items = self.api_client.perform_crud(self.field.parent_endpoint, "GET")
-        self.dropdown_options[self.field.name] = {
-            item[self.field.parent_id]: item[self.field.parent_label] for item in items
-        }
-
-    def _get_selected_foreign_key_id(self, options, selected_label):
-        for id_, label in options.items():
-            if label == selected_label:
-                return id_
-        return None
+        """Create a typeahead: a prefix search box feeding a selectbox of matching ids."""
+        search_col, select_col = st.columns([1, 2], vertical_alignment='bottom')
+        with search_col:
+            prefix = st.text_input(
+                f'Search {self.field.parent_endpoint}',
+                placeholder=f'{self.field.parent_label} starts with...',
+                key=f'{self.field.name}-search'
+            )
+        options = self.option_store.search(self.field, prefix.strip())
+        with select_col:
+            return st.selectbox(
+                create_title(self.field),
+                options=list(options.labels),
+                format_func=options.format,
+                label_visibility='visible',
+                key=f'{self.field.name}'
+            )
@@ -1,11 +1,18 @@
 # ./src/components/form_tree.py
 import streamlit as st
-from src.schemas import Field, FieldType
+from src.schemas import Field
 from src.components.form_row import FormRow
 from src.api import APIClient
+from src.options import get_option_store
 from datetime import date
+from typing import TYPE_CHECKING
 import logging
 
+if TYPE_CHECKING:
+    # registry -> form -> form_tree would be circular at runtime
+    from src.components.form import Form
+    from src.components.registry import CompiledForm, Layout
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,32 +27,39 @@ class FormTree:
     of nested forms behind the scenes.
     """
 
-    def __init__(self, api_client: APIClient, fields: list[Field], forms):
+    def __init__(self, api_client: APIClient, compiled: 'CompiledForm', forms):
         """
-        Initializes the FormTree with a set of fields and their corresponding forms.
+        Initializes the FormTree from a compiled form; only per-rerun state is created here.
 
         Args:
             api_client (APIClient): A client to interact with the API for data retrieval and submission.
-            fields (list[Field]): A list of `Field` objects that represent the form fields.
-            forms (dict): A dictionary mapping form endpoints to their corresponding `FormTree` child class instances.
+            compiled (CompiledForm): The form, building and memoizing its layouts as "New" expansions are used.
+            forms (dict): A dictionary mapping form endpoints to their corresponding `Form` instances.
 
         Attributes:
             api_client (APIClient): An instance of the API client used for data operations.
+            compiled (CompiledForm): The compiled form being rendered.
+            layout (Layout): The layout for the "New" checkboxes ticked so far this rerun.
             fields (list[Field]): The list of `Field` objects to be rendered in the form.
-            forms (dict): Maps form endpoints to their respective `FormTree` instances.
-            rows (list[FormRow]): A list of `FormRow` objects representing each row in the form.
+            forms (dict): Maps form endpoints to their respective `Form` instances.
+            option_store (OptionStore): Session-wide foreign-key options shared by all rows.
+            rows (list[FormRow]): The `FormRow` objects rendered this rerun, in layout order.
             pending_fk (dict): Tracks foreign-key fields that need to have their IDs injected after API responses.
             input_data (dict): Stores the user input data, keyed by form endpoint and field name.
         """
         self.api_client: APIClient = api_client
-        self.fields: list[Field] = fields
-        self.forms: dict[str, type[FormTree]] = forms
+        self.compiled: 'CompiledForm' = compiled
+        self.layout: 'Layout' = compiled.layout()
+        self.fields: list[Field] = compiled.form.fields_list
+        self.forms: dict[str, 'Form'] = forms
+        self.option_store = get_option_store(api_client)
         self.rows: list[FormRow] = []
         self.pending_fk: dict[str, dict[str, str]] = {}
         self.input_data: dict[str, dict[str, int | float | str | date]] = {}
         self.selected_operation: str | None = None
         self.record_id: int | None = None
-        self.initialize_fields(fields)
+        self.track_layout_endpoints()
+        self.option_store.prefetch(compiled.foreign_keys)
 
     def show_form(self):
         """Render the form, allow operation selection, and handle submission."""
@@ -64,54 +78,39 @@ class FormTree:
         if st.button("Submit", key='form-submit'):
             self.submit()
 
-    def initialize_fields(self, fields, insert_after=None):
-        """Initialize the fields, adding to end or after specified index."""
-        new_rows = [self.create_row(field) for field in fields]
-        if insert_after is None:
-            self.rows.extend(new_rows)
-        else:
-            self.rows[insert_after + 1:insert_after + 1] = new_rows
-
-    def create_row(self, field):
-        """Create a FormRow and track any foreign keys."""
-        if field.form_endpoint not in self.pending_fk:
-            self.pending_fk[field.form_endpoint] = {}
-
-        if field.type == FieldType.FOREIGN_KEY:
-            self.pending_fk[field.form_endpoint][field.parent_endpoint] = None
-
-        if field.form_name not in self.input_data:
-            self.input_data[field.form_endpoint] = {}
-
-        return FormRow(field, self.api_client)
+    def track_layout_endpoints(self):
+        """Add input data slots for the layout's endpoints, keeping first-appearance order for submission."""
+        for endpoint in self.layout.endpoints:
+            self.input_data.setdefault(endpoint, {})
 
     def render_rows(self):
         """Render form rows and track input data."""
         is_op_create = self.selected_operation=='Create'
-        for i, row in enumerate(self.rows):
+        expanded = frozenset()
+        i = 0
+        # Ticking "New" switches to the layout with the parent's rows inserted after row i
+        while i < len(self.layout.fields):
+            field = self.layout.fields[i]
+            row = FormRow(field, self.api_client, self.option_store)
+            self.rows.append(row)
             field_data = row.render(fk_tracker=self.pending_fk, allow_new=is_op_create)
             if row.is_new and field_data is None:
-                self.add_child_rows(row.field.parent_endpoint, insert_after=i)
+                expanded |= {(field.form_endpoint, field.name)}
+                self.layout = self.compiled.layout(expanded)
+                self.track_layout_endpoints()
             else:
-                self.input_data[row.field.form_endpoint][row.field.name] = field_data
-            
+                self.input_data[field.form_endpoint][field.name] = field_data
+
             # Creates line under each row.
             st.write('___')
-
-    def add_child_rows(self, parent_endpoint, insert_after):
-        """Add fields from a child endpoint dynamically to the form."""
-        child_form_class = self.forms.get(parent_endpoint)
-        if not child_form_class:
-            raise ValueError(f"No form class found for endpoint: {parent_endpoint}")
-
-        self.initialize_fields(child_form_class.fields_list, insert_after=insert_after)
+            i += 1
 
     def get_row(self, endpoint, field_name):
-        """Retrieve a Field object by its name."""
-        for row in self.rows:
-            if row.field.form_endpoint == endpoint and row.field.name == field_name:
-                return row
-        return None
+        """Retrieve a rendered FormRow by its endpoint and field name."""
+        i = self.layout.index.get((endpoint, field_name))
+        if i is None or i >= len(self.rows):
+            return None
+        return self.rows[i]
 
     def submit(self):
         """Submit the form data to the API."""
@@ -129,7 +128,7 @@ class FormTree:
                         response = self.api_client.perform_crud(endpoint, "PUT", data=ready_data, id=self.record_id)
                     foreign_keys[endpoint] = response.get('id')
 
-        self.api_client.clear_cache()
+        # Writes evict their own endpoints (and dependents) from the API cache
         st.rerun()
 
     def supply_pending_ids(self, endpoint, data, foreign_keys):
@@ -0,0 +1,107 @@
+# ./src/components/registry.py
+from src.schemas import Field, FieldType, FieldTemplate
+from src.components.form import Form
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Layout:
+    """
+    The flattened rows of a form for one combination of expanded "New" foreign keys.
+
+    Attributes:
+        fields (tuple[Field]): Fields in render order, with each expanded parent form inserted after its foreign key.
+        index (dict): Maps `(form_endpoint, field_name)` to the field's position in `fields`.
+        endpoints (tuple[str]): Form endpoints in order of first appearance; submission runs in reverse.
+    """
+    def __init__(self, fields: list[Field]):
+        self.fields = tuple(fields)
+        self.index = {(field.form_endpoint, field.name): i for i, field in enumerate(self.fields)}
+        self.endpoints = tuple(dict.fromkeys(field.form_endpoint for field in self.fields))
+
+class CompiledForm:
+    """
+    A form whose layouts are built on first use and kept for every later rerun and session.
+
+    Layouts are keyed by the frozenset of expanded `(form_endpoint, field_name)` foreign keys.
+    Only combinations a user actually expands get built; there are 2^k of them in all.
+    """
+    def __init__(self, form: Form, forms: dict[str, Form]):
+        self.form = form
+        self.forms = forms
+        self.layouts: dict[frozenset, Layout] = {}
+        self.foreign_keys: list[Field] = self._reachable_foreign_keys()
+
+    def layout(self, expanded: frozenset = frozenset()) -> Layout:
+        layout = self.layouts.get(expanded)
+        if layout is None:
+            # Sessions racing to build the same layout build equal ones; the first stored wins
+            layout = self.layouts.setdefault(expanded, Layout(self._flatten(self.form.endpoint, expanded)))
+        return layout
+
+    def _flatten(self, endpoint, expanded):
+        fields = []
+        for field in self.forms[endpoint].fields_list:
+            fields.append(field)
+            if (field.form_endpoint, field.name) in expanded:
+                fields.extend(self._flatten(field.parent_endpoint, expanded))
+        return fields
+
+    def _reachable_foreign_keys(self):
+        """One foreign-key field per parent endpoint a row could need, across all expansions."""
+        reachable = {}
+        visited = set()
+        pending = [self.form.endpoint]
+        while pending:
+            endpoint = pending.pop()
+            if endpoint in visited:
+                continue
+            visited.add(endpoint)
+            for field in self.forms[endpoint].fields_list:
+                if field.type == FieldType.FOREIGN_KEY:
+                    reachable.setdefault(field.parent_endpoint, field)
+                    if field.parent_endpoint in self.forms:
+                        pending.append(field.parent_endpoint)
+        return list(reachable.values())
+
+class FormRegistry:
+    """
+    Form definitions compiled once per process.
+
+    Converts each form's `FieldTemplate`s into `Field`/`ForeignKeyField` instances and
+    wraps each form in a `CompiledForm`. Meant to be built under `st.cache_resource`, so it
+    must not hold per-session state.
+
+    Attributes:
+        forms (dict[str, Form]): Maps form endpoints to their initialized forms.
+        compiled (dict[str, CompiledForm]): Maps form endpoints to their compiled forms.
+    """
+    def __init__(self, forms: list[Form]):
+        self.forms: dict[str, Form] = {form.endpoint: form for form in forms}
+        for form in forms:
+            form.fields_list = self._get_initialized_fields_from_form(form)
+
+        self.compiled = {endpoint: CompiledForm(form, self.forms) for endpoint, form in self.forms.items()}
+        logger.info(f'compiled {len(self.compiled)} forms')
+
+    def _get_initialized_fields_from_form(self, form: Form):
+        new_fields_list = []
+        for field in form.fields_list:
+            if not isinstance(field, FieldTemplate):
+                new_fields_list.append(field)
+            else:
+                initialized_field = field.as_field(
+                    form_name=form.name,
+                    form_endpoint=form.endpoint,
+                    forms=self.forms
+                )
+                new_fields_list.append(initialized_field)
+
+        return new_fields_list
+
+    def get(self, endpoint: str) -> CompiledForm:
+        compiled = self.compiled.get(endpoint)
+        if not compiled:
+            raise ValueError(f"No form class found for endpoint: {endpoint}")
+        return compiled
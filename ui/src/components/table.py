@@ -1,19 +1,75 @@
 # ./src/components/table.py
 import streamlit as st
 import pandas as pd
+from src.settings import table_page_size
+from src import profiling
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 class TableDisplay:
+    """
+    Displays an endpoint's rows one page at a time.
+
+    Sorting and filtering are pushed down to the API, so only the visible page is
+    ever downloaded. The next page is prefetched in the background and recently
+    viewed pages are kept in the API client's bounded page cache.
+    """
+    page_sizes = (25, 50, 100, 250)
+
     def __init__(self, api_client):
         self.api_client = api_client
 
-    def show_table(self, endpoint):
-        data = self.api_client.fetch_data(endpoint)
-        if data:
-            df = pd.DataFrame(data).set_index('id')
-            st.dataframe(df)
+    def show_table(self, endpoint, columns):
+        query = self._render_query_controls(endpoint, columns)
+        limit = query.pop('limit')
+        page_number = query.pop('page')
+
+        page = self.api_client.fetch_page(endpoint, offset=(page_number - 1) * limit, limit=limit, **query)
+        total = page['total']
+        page_count = max(1, -(-total // limit))
+        if page_number > page_count:
+            # Filters or writes can shrink the table below the selected page
+            page_number = page_count
+            page = self.api_client.fetch_page(endpoint, offset=(page_number - 1) * limit, limit=limit, **query)
+
+        if page['rows']:
+            with profiling.timed('dataframe', endpoint=endpoint, rows=len(page['rows'])):
+                df = pd.DataFrame(page['rows']).set_index('id')
+                st.dataframe(df)
+            start = (page_number - 1) * limit
+            st.caption(f"Rows {start + 1}-{start + len(page['rows'])} of {total} · page {page_number} of {page_count}")
         else:
             st.write("No data available.")
+
+        if page_number < page_count:
+            self.api_client.prefetch_page(endpoint, offset=page_number * limit, limit=limit, **query)
+
+    def _render_query_controls(self, endpoint, columns):
+        sort_col, order_col, field_col, value_col, size_col, page_col = st.columns([3, 2, 3, 4, 2, 2], vertical_alignment='bottom')
+        with sort_col:
+            sort = st.selectbox('Sort by', options=columns, key=f'{endpoint}-table-sort')
+        with order_col:
+            descending = st.toggle('Descending', key=f'{endpoint}-table-descending')
+        with field_col:
+            filter_field = st.selectbox('Filter on', options=columns, key=f'{endpoint}-table-filter-field')
+        with value_col:
+            filter_value = st.text_input('Contains', key=f'{endpoint}-table-filter-value')
+        with size_col:
+            limit = st.selectbox('Rows', options=self.page_sizes, index=self._default_size_index(), key=f'{endpoint}-table-limit')
+        with page_col:
+            page = st.number_input('Page', min_value=1, step=1, key=f'{endpoint}-table-page')
+
+        return {
+            'sort': sort,
+            'descending': descending,
+            'filter_field': filter_field,
+            'filter_value': filter_value.strip(),
+            'limit': limit,
+            'page': int(page),
+        }
+
+    def _default_size_index(self):
+        sizes = list(self.page_sizes)
+        return sizes.index(table_page_size) if table_page_size in sizes else 0
@@ -0,0 +1,70 @@
+# ./src/options.py
+import streamlit as st
+from collections import OrderedDict
+from src.api import APIClient
+from src.schemas import ForeignKeyField
+from src.settings import fk_search_limit, query_cache_size
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ForeignKeyOptions:
+    """One page of selectbox options for a parent endpoint, keyed by id."""
+    max_label_length = 60
+
+    def __init__(self, items: list[dict], id_field: str, label_field: str):
+        self.source = items
+        self.labels: dict = {item[id_field]: item[label_field] for item in items}
+
+    def format(self, id_) -> str:
+        """Selectbox label; the id is shown since labels need not be unique."""
+        label = str(self.labels.get(id_, ''))
+        if label == str(id_):
+            return label
+        if len(label) > self.max_label_length:
+            label = label[:self.max_label_length - 1] + '…'
+        return f'{label} [{id_}]'
+
+class OptionStore:
+    """
+    Foreign-key options shared by every `FormRow` of a session.
+
+    Options are server-side prefix searches on the parent's label field, so only a
+    bounded page of rows is ever loaded. Pages are built from the API client's cached
+    reads and rebuilt only when the underlying read changed, e.g. after a write
+    invalidated the parent endpoint.
+    """
+    def __init__(self, api_client: APIClient, limit: int = fk_search_limit, max_queries: int = query_cache_size):
+        self.api_client = api_client
+        self.limit = limit
+        self.max_queries = max_queries
+        self._options: OrderedDict[tuple, ForeignKeyOptions] = OrderedDict()
+
+    def _search_read(self, field: ForeignKeyField, prefix: str = ''):
+        params = {'field': field.parent_label, 'prefix': prefix, 'limit': self.limit}
+        return (field.parent_endpoint, 'search', params)
+
+    def search(self, field: ForeignKeyField, prefix: str = '') -> ForeignKeyOptions:
+        items = self.api_client.fetch_data(*self._search_read(field, prefix))
+        key = (field.parent_endpoint, field.parent_id, field.parent_label, prefix)
+        options = self._options.get(key)
+        if options is None or options.source is not items:
+            options = ForeignKeyOptions(items, field.parent_id, field.parent_label)
+            self._options[key] = options
+            if len(self._options) > self.max_queries:
+                self._options.popitem(last=False)
+        self._options.move_to_end(key)
+        return options
+
+    def prefetch(self, fields: list[ForeignKeyField]):
+        """Load the first page of options for each foreign-key field concurrently."""
+        self.api_client.fetch_many(self._search_read(field) for field in fields)
+
+def get_option_store(api_client: APIClient) -> OptionStore:
+    """Return the session's option store, bound to the current rerun's api client."""
+    if 'fk_option_store' not in st.session_state:
+        st.session_state['fk_option_store'] = OptionStore(api_client)
+    store = st.session_state['fk_option_store']
+    store.api_client = api_client
+    return store
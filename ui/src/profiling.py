@@ -0,0 +1,80 @@
+# ./src/profiling.py
+import streamlit as st
+import pandas as pd
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import time
+import logging
+from src.settings import profiling_enabled, profiling_slow_ms
+
+logger = logging.getLogger(__name__)
+
+
+class Profiler:
+    """
+    Collects timings for one script rerun.
+
+    Each record is a dict with a `phase`, its duration in `ms` and any extra
+    attributes, e.g. the endpoint, bytes transferred or whether the cache was hit.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records: list[dict] = []
+
+    def record(self, phase: str, ms: float, **attrs):
+        self.records.append({'phase': phase, 'ms': round(ms, 3), **attrs})
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def log(self):
+        """Write the rerun as one structured log line; slow reruns are logged as warnings."""
+        total_ms = self.total_ms
+        level = logging.WARNING if total_ms >= profiling_slow_ms else logging.INFO
+        logger.log(level, json.dumps({'event': 'ui_rerun', 'total_ms': round(total_ms, 3), 'phases': self.records}, default=str))
+
+    def show(self):
+        """Render the timings in a sidebar panel."""
+        with st.sidebar.expander('Profiling', expanded=False):
+            st.write(f'Rerun: **{self.total_ms:.1f} ms**')
+            if self.records:
+                df = pd.DataFrame(self.records)
+                st.dataframe(df.groupby('phase')['ms'].agg(['count', 'sum', 'max']).sort_values('sum', ascending=False))
+                st.dataframe(df, hide_index=True)
+
+# Worker threads only see the profiler when run inside a copied context
+_current: ContextVar[Profiler | None] = ContextVar('profiler', default=None)
+
+def start() -> Profiler | None:
+    """Begin profiling a rerun when enabled through `UI_PROFILING`."""
+    profiler = Profiler() if profiling_enabled else None
+    _current.set(profiler)
+    return profiler
+
+def finish():
+    profiler = _current.get()
+    if profiler:
+        profiler.show()
+        profiler.log()
+    _current.set(None)
+
+def record(phase: str, ms: float = 0.0, **attrs):
+    profiler = _current.get()
+    if profiler:
+        profiler.record(phase, ms, **attrs)
+
+@contextmanager
+def timed(phase: str, **attrs):
+    """Time the enclosed block; the yielded dict can be filled with attributes known only afterwards."""
+    profiler = _current.get()
+    if not profiler:
+        yield {}
+        return
+
+    start_time = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        profiler.record(phase, (time.perf_counter() - start_time) * 1000, **attrs)
@@ -0,0 +1,43 @@
+# ./src/replica.py
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TableReplica:
+    """
+    A local copy of one endpoint's rows, kept current by applying deltas from `GET /{endpoint}/changes`.
+
+    Attributes:
+        endpoint (str): The endpoint being replicated.
+        version (int): Cursor returned with the last delta; sent as `since` on the next sync.
+        rows (dict[int, dict]): Rows keyed by id.
+    """
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.version = 0
+        self.rows: dict[int, dict] = {}
+        self.lock = threading.Lock()
+
+    def apply(self, changes: dict) -> bool:
+        """Apply a delta; returns whether anything changed."""
+        with self.lock:
+            # A delta is read in one snapshot, so an id in both lists was deleted and then
+            # re-inserted (e.g. moved between partitions); applying deletes first keeps it
+            for row_id in changes['deleted']:
+                self.rows.pop(row_id, None)
+            for row in changes['upserted']:
+                self.rows[row['id']] = row
+            changed = changes['version'] != self.version
+            self.version = changes['version']
+
+        if changed:
+            logger.info(f"synced {self.endpoint} to version {self.version}: "
+                        f"{len(changes['upserted'])} upserted, {len(changes['deleted'])} deleted")
+        return changed
+
+    @property
+    def data(self) -> list[dict]:
+        with self.lock:
+            return sorted(self.rows.values(), key=lambda row: row['id'])
@@ -11,6 +11,27 @@ layout_mode = 'wide'
 logging_level = os.getenv('LOGGING_LEVEL', 'INFO')
 api_url = os.getenv('API_URL', 'http://api:8000')
 
+# API client
+api_timeout = float(os.getenv('API_TIMEOUT', 10))
+api_retries = int(os.getenv('API_RETRIES', 3))
+api_backoff = float(os.getenv('API_BACKOFF', 0.3))
+api_pool_size = int(os.getenv('API_POOL_SIZE', 8))
+
+# API read cache; unset means unbounded / never expires
+cache_max_entries = int(os.environ['CACHE_MAX_ENTRIES']) if os.getenv('CACHE_MAX_ENTRIES') else None
+cache_ttl = float(os.environ['CACHE_TTL']) if os.getenv('CACHE_TTL') else None
+query_cache_size = int(os.getenv('QUERY_CACHE_SIZE', 256))
+page_cache_size = int(os.getenv('PAGE_CACHE_SIZE', 32))
+
+# Data table: rows fetched per page
+table_page_size = int(os.getenv('TABLE_PAGE_SIZE', 50))
+
+# Foreign-key typeahead: rows shown per search
+fk_search_limit = int(os.getenv('FK_SEARCH_LIMIT', 50))
+
+# Opt-in rerun profiling: sidebar panel plus one structured log line per rerun
+profiling_enabled = os.getenv('UI_PROFILING', 'false').lower() in ('1', 'true', 'yes')
+profiling_slow_ms = float(os.getenv('UI_PROFILING_SLOW_MS', 1000))
+
 # Configure logging
 logging.basicConfig(level=logging_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-